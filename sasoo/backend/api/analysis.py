@@ -23,6 +23,7 @@ from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
 logger = logging.getLogger(__name__)
 
 from models.database import (
+    commit_db,
     execute_insert,
     execute_update,
     fetch_all,
@@ -1051,7 +1052,7 @@ async def _run_full_analysis(paper_id: int):
         paper_dir = get_paper_dir(folder_name)
 
         # Read PDF text (cached)
-        full_text = get_pdf_text(paper_dir)
+        full_text = await asyncio.to_thread(get_pdf_text, paper_dir)
 
         # Check for cancellation
         if cancel_event.is_set():
@@ -1232,7 +1233,7 @@ async def run_analysis(paper_id: int, background_tasks: BackgroundTasks):
     # Clear previous results if re-running
     db = await get_db()
     await db.execute("DELETE FROM analysis_results WHERE paper_id = ?", (paper_id,))
-    await db.commit()
+    await commit_db(db)
 
     # Launch background analysis
     background_tasks.add_task(_run_full_analysis, paper_id)
@@ -1440,7 +1441,7 @@ async def get_mermaid(paper_id: int):
     paper_dir = get_paper_dir(folder_name)
     paper_text = ""
     try:
-        paper_text = get_pdf_text(paper_dir)
+        paper_text = await asyncio.to_thread(get_pdf_text, paper_dir)
     except FileNotFoundError:
         pass
 
@@ -1637,7 +1638,7 @@ async def explain_figure(paper_id: int, figure_id: int):
     paper_dir = get_paper_dir(folder_name)
     full_text = ""
     try:
-        full_text = get_pdf_text(paper_dir)
+        full_text = await asyncio.to_thread(get_pdf_text, paper_dir)
     except FileNotFoundError:
         pass
 
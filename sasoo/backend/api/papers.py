@@ -3,6 +3,7 @@ Sasoo - Papers API Router
 Endpoints for uploading, listing, retrieving, updating, and deleting papers.
 """
 
+import asyncio
 import json
 import re
 import shutil
@@ -18,6 +19,7 @@ from fastapi.responses import FileResponse
 from services.pdf_cache import warm_cache
 
 from models.database import (
+    commit_db,
     execute_insert,
     execute_update,
     fetch_all,
@@ -382,6 +384,8 @@ def extract_figures_from_pdf(pdf_path: str, output_dir: str) -> list[dict]:
             pix.save(str(fig_path))
 
             width, height = pix.width, pix.height
+            # Drop the pixmap now instead of holding it through the next render
+            pix = None
             quality = "high"
             if width < 200 or height < 200:
                 quality = "low"
@@ -454,7 +458,7 @@ async def upload_paper(file: UploadFile = File(...)):
         f.write(content)
 
     # Pre-cache full text for later analysis phases
-    warm_cache(paper_dir)
+    await asyncio.to_thread(warm_cache, paper_dir)
 
     # Extract figures
     figures_dir = get_figures_dir(folder_name)
@@ -524,7 +528,7 @@ async def upload_paper(file: UploadFile = File(...)):
             """,
             (paper_id, fig["figure_num"], fig["caption"], fig["file_path"], fig["quality"]),
         )
-    await db.commit()
+    await commit_db(db)
 
     # Fetch and return the created record
     paper = await fetch_one("SELECT * FROM papers WHERE id = ?", (paper_id,))
@@ -625,7 +629,7 @@ async def backfill_all_captions():
                     (caption_map[fn], fig["id"]),
                 )
                 total_updated += 1
-        await db.commit()
+        await commit_db(db)
 
     return {"total_updated": total_updated, "papers_processed": len(papers)}
 
@@ -711,7 +715,7 @@ async def delete_paper(paper_id: int):
     await db.execute("DELETE FROM analysis_results WHERE paper_id = ?", (paper_id,))
     await db.execute("DELETE FROM figures WHERE paper_id = ?", (paper_id,))
     await db.execute("DELETE FROM papers WHERE id = ?", (paper_id,))
-    await db.commit()
+    await commit_db(db)
 
     # Remove files from disk (figures are now inside paper_dir)
     paper_dir = get_paper_dir(folder_name)
@@ -757,7 +761,7 @@ async def backfill_captions(paper_id: int):
                 (caption_map[fn], fig["id"]),
             )
             updated += 1
-    await db.commit()
+    await commit_db(db)
 
     return {"updated": updated, "total": len(figures), "captions": caption_map}
 
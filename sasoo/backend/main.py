@@ -5,6 +5,7 @@ FastAPI entry point.
 Runs on http://localhost:8000 by default.
 """
 
+import asyncio
 import os
 import ssl
 from contextlib import asynccontextmanager
@@ -29,6 +30,7 @@ from models.database import (
     close_db,
     init_db,
 )
+from services.pdf_cache import shutdown_process_pool
 
 # Load .env from project root (if present)
 _env_path = Path(__file__).resolve().parent / ".env"
@@ -69,9 +71,14 @@ async def lifespan(app: FastAPI):
     if gemini_key:
         os.environ["GOOGLE_API_KEY"] = gemini_key
 
+    # Importing the naming service schedules a background Gemini warmup
+    # (DNS/TLS handshake) so the first upload doesn't pay for it.
+    import services.naming_service  # noqa: F401
+
     yield
 
     # --- Shutdown ---
+    await asyncio.to_thread(shutdown_process_pool)
     await close_db()
     print("[Sasoo] Database connection closed.")
 
@@ -176,9 +183,13 @@ async def shutdown():
 
 if __name__ == "__main__":
     import argparse
+    import multiprocessing
     import sys
     import uvicorn
 
+    # Bundled builds must hand PDF text worker processes off before argparse
+    multiprocessing.freeze_support()
+
     parser = argparse.ArgumentParser(description="Sasoo Backend Server")
     parser.add_argument("--host", default="127.0.0.1", help="Host to bind to")
     parser.add_argument("--port", type=int, default=8000, help="Port to bind to")
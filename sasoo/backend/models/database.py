@@ -12,11 +12,16 @@ Paths:
     - Production:  %APPDATA%/Sasoo/library/ (default, changeable in Settings)
 """
 
+import asyncio
+import logging
 import os
 import sys
 import aiosqlite
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Any, AsyncIterator, Optional
+
+logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -140,6 +145,10 @@ CREATE TABLE IF NOT EXISTS figures (
 CREATE INDEX IF NOT EXISTS idx_papers_status ON papers(status);
 CREATE INDEX IF NOT EXISTS idx_papers_domain ON papers(domain);
 CREATE INDEX IF NOT EXISTS idx_papers_year ON papers(year);
+CREATE INDEX IF NOT EXISTS idx_papers_agent_used ON papers(agent_used);
+CREATE INDEX IF NOT EXISTS idx_papers_created_at ON papers(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_papers_analyzed_at ON papers(analyzed_at DESC);
+CREATE INDEX IF NOT EXISTS idx_papers_domain_status ON papers(domain, status, created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_analysis_paper_id ON analysis_results(paper_id);
 CREATE INDEX IF NOT EXISTS idx_analysis_phase ON analysis_results(phase);
 CREATE INDEX IF NOT EXISTS idx_analysis_created_at ON analysis_results(created_at);
@@ -165,6 +174,64 @@ CREATE TABLE IF NOT EXISTS settings (
 
 _db_connection: Optional[aiosqlite.Connection] = None
 
+# Read-only connections: WAL allows these to run concurrently with each
+# other and with the single writer above.
+READ_POOL_SIZE = 4
+_read_pool: Optional[asyncio.Queue] = None
+_read_connections: list[aiosqlite.Connection] = []
+
+# Per-connection tuning applied when a connection is opened.
+# WAL lets readers proceed alongside the writer; synchronous=NORMAL is
+# durable under WAL except on power loss of the last transaction.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",      # ~64 MB page cache
+    "PRAGMA mmap_size=268435456",    # 256 MB memory-mapped I/O
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA wal_autocheckpoint=1000",  # checkpoint every ~4 MB of WAL
+    "PRAGMA busy_timeout=5000",
+)
+
+
+READ_CONNECTION_PRAGMAS = (
+    "PRAGMA query_only=ON",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",      # ~16 MB page cache per reader
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+)
+
+# Prepared statements kept per connection (sqlite3 defaults to 128); the
+# read helpers issue a fixed set of SQL strings, so they stay prepared.
+STATEMENT_CACHE_SIZE = 512
+
+
+async def _configure_connection(
+    conn: aiosqlite.Connection,
+    pragmas: tuple[str, ...] = CONNECTION_PRAGMAS,
+) -> None:
+    """Apply row factory and PRAGMAs to a freshly opened connection."""
+    conn.row_factory = aiosqlite.Row
+    for pragma in pragmas:
+        await conn.execute(pragma)
+
+
+async def _open_read_pool() -> None:
+    """Open READ_POOL_SIZE read-only connections into the read pool."""
+    global _read_pool
+    pool: asyncio.Queue = asyncio.Queue()
+    ro_uri = f"{DB_PATH.as_uri()}?mode=ro"
+    for _ in range(READ_POOL_SIZE):
+        conn = await aiosqlite.connect(
+            ro_uri, uri=True, cached_statements=STATEMENT_CACHE_SIZE
+        )
+        await _configure_connection(conn, READ_CONNECTION_PRAGMAS)
+        _read_connections.append(conn)
+        pool.put_nowait(conn)
+    _read_pool = pool
+
 
 async def init_db() -> None:
     """
@@ -172,6 +239,7 @@ async def init_db() -> None:
     1. Create library directories if missing.
     2. Open the SQLite connection.
     3. Apply schema migrations (idempotent).
+    4. Open the read-only connection pool.
     """
     global _db_connection
 
@@ -179,13 +247,10 @@ async def init_db() -> None:
     APP_DATA_ROOT.mkdir(parents=True, exist_ok=True)
     LIBRARY_ROOT.mkdir(parents=True, exist_ok=True)
 
-    _db_connection = await aiosqlite.connect(str(DB_PATH))
-    _db_connection.row_factory = aiosqlite.Row
-
-    # Enable WAL mode for better concurrent read performance
-    await _db_connection.execute("PRAGMA journal_mode=WAL")
-    # Enable foreign key enforcement
-    await _db_connection.execute("PRAGMA foreign_keys=ON")
+    _db_connection = await aiosqlite.connect(
+        str(DB_PATH), cached_statements=STATEMENT_CACHE_SIZE
+    )
+    await _configure_connection(_db_connection)
 
     await _db_connection.executescript(SCHEMA_SQL)
     await _db_connection.executescript(SETTINGS_SQL)
@@ -198,10 +263,16 @@ async def init_db() -> None:
     except Exception:
         pass  # Column already exists
 
+    # Refresh planner statistics so list queries pick the sort indexes
+    await _db_connection.execute("ANALYZE papers")
+    await _db_connection.commit()
+
+    await _open_read_pool()
+
 
 async def get_db() -> aiosqlite.Connection:
     """
-    Return the shared database connection.
+    Return the shared, long-lived database connection opened by init_db().
     Raises RuntimeError if called before init_db().
     """
     if _db_connection is None:
@@ -209,10 +280,38 @@ async def get_db() -> aiosqlite.Connection:
     return _db_connection
 
 
+@asynccontextmanager
+async def read_connection() -> AsyncIterator[aiosqlite.Connection]:
+    """
+    Borrow a read-only connection from the pool for the duration of the
+    block. Falls back to the shared writer connection if the pool is not
+    open (e.g. in scripts that only call init_db partially).
+    """
+    if _read_pool is None:
+        yield await get_db()
+        return
+    conn = await _read_pool.get()
+    try:
+        yield conn
+    finally:
+        _read_pool.put_nowait(conn)
+
+
 async def close_db() -> None:
-    """Close the database connection gracefully."""
-    global _db_connection
+    """Close the database connections gracefully."""
+    global _db_connection, _read_pool, _insert_batcher
+    if _insert_batcher is not None:
+        await _insert_batcher.close()
+        _insert_batcher = None
+    _read_pool = None
+    while _read_connections:
+        await _read_connections.pop().close()
     if _db_connection is not None:
+        # Let SQLite refresh any statistics the session's queries found stale
+        try:
+            await _db_connection.execute("PRAGMA optimize")
+        except aiosqlite.Error:
+            pass  # Best effort; never block shutdown
         await _db_connection.close()
         _db_connection = None
 
@@ -221,6 +320,27 @@ async def close_db() -> None:
 # Helper utilities
 # ---------------------------------------------------------------------------
 
+# Number of commits on the shared connection; read-result caches key on it
+# so nothing written through this module is served stale
+_write_version = 0
+
+
+def write_version() -> int:
+    """Return a counter that changes after every commit made via commit_db()."""
+    return _write_version
+
+
+async def commit_db(db: Optional[aiosqlite.Connection] = None) -> None:
+    """Commit the shared connection (or ``db``) and bump write_version()."""
+    global _write_version
+    if db is None:
+        db = await get_db()
+    try:
+        await db.commit()
+    finally:
+        _write_version += 1
+
+
 async def fetch_one(query: str, params: tuple = ()) -> Optional[dict]:
     """Execute a query and return a single row as dict, or None."""
     db = await get_db()
@@ -239,22 +359,165 @@ async def fetch_all(query: str, params: tuple = ()) -> list[dict]:
     return [dict(row) for row in rows]
 
 
+async def fetch_one_ro(query: str, params: tuple = ()) -> Optional[dict]:
+    """Like fetch_one, but runs on a pooled read-only connection."""
+    async with read_connection() as db:
+        cursor = await db.execute(query, params)
+        row = await cursor.fetchone()
+    if row is None:
+        return None
+    return dict(row)
+
+
+async def fetch_all_ro(query: str, params: tuple = ()) -> list[dict]:
+    """Like fetch_all, but runs on a pooled read-only connection."""
+    async with read_connection() as db:
+        cursor = await db.execute(query, params)
+        rows = await cursor.fetchall()
+    return [dict(row) for row in rows]
+
+
 async def execute_insert(query: str, params: tuple = ()) -> int:
     """Execute an INSERT and return the lastrowid."""
     db = await get_db()
     cursor = await db.execute(query, params)
-    await db.commit()
+    await commit_db(db)
     return cursor.lastrowid
 
 
+# ---------------------------------------------------------------------------
+# Batched inserts
+# ---------------------------------------------------------------------------
+
+INSERT_BATCH_MAX = 128
+INSERT_BATCH_WAIT_S = 0.01
+
+
+class _InsertBatcher:
+    """
+    Coalesces concurrent INSERTs on the shared connection into a single
+    transaction so a burst of N inserts pays for one commit (fsync)
+    instead of N. Each caller still gets its own lastrowid or exception.
+    """
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._batch: list[tuple[str, tuple, asyncio.Future]] = []
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, query: str, params: tuple) -> int:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((query, params, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch = batch = [await self._queue.get()]
+            deadline = loop.time() + INSERT_BATCH_WAIT_S
+            while len(batch) < INSERT_BATCH_MAX:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._flush(batch)
+            except Exception as exc:
+                # Keep the batcher alive for later submitters
+                logger.exception("Batched insert flush failed")
+                _fail_pending(batch, exc)
+            self._batch = []
+
+    async def _flush(self, batch: list[tuple[str, tuple, asyncio.Future]]) -> None:
+        results: list[tuple[asyncio.Future, Any]] = []
+        db = None
+        try:
+            db = await get_db()
+            for query, params, future in batch:
+                if future.done():
+                    continue  # Caller was cancelled before its insert ran
+                try:
+                    cursor = await db.execute(query, params)
+                except Exception as exc:
+                    # SQLite undoes only the failed statement; the rest of
+                    # the batch still commits
+                    future.set_exception(exc)
+                    continue
+                results.append((future, cursor.lastrowid))
+            await commit_db(db)
+        except Exception as exc:
+            # Nothing from this batch was committed; roll it back so it
+            # cannot ride along with the next commit on the connection
+            if db is not None:
+                try:
+                    await db.rollback()
+                except Exception:
+                    logger.exception("Rollback of failed insert batch failed")
+            _fail_pending(batch, exc)
+            return
+        for future, rowid in results:
+            if not future.done():
+                future.set_result(rowid)
+
+    async def close(self) -> None:
+        """Stop the flush task and fail every insert it will not run."""
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        exc = RuntimeError("Database closed before the insert was committed")
+        _fail_pending(self._batch, exc)
+        while not self._queue.empty():
+            _fail_pending([self._queue.get_nowait()], exc)
+
+
+def _fail_pending(
+    batch: list[tuple[str, tuple, asyncio.Future]], exc: BaseException
+) -> None:
+    """Set exc on every future in batch that has no outcome yet."""
+    for _, _, future in batch:
+        if not future.done():
+            future.set_exception(exc)
+
+
+_insert_batcher: Optional[_InsertBatcher] = None
+
+
+async def execute_insert_batched(query: str, params: tuple = ()) -> int:
+    """
+    Like execute_insert, but commits together with any other inserts
+    submitted within INSERT_BATCH_WAIT_S. Returns the lastrowid.
+    """
+    global _insert_batcher
+    if _insert_batcher is None:
+        _insert_batcher = _InsertBatcher()
+    return await _insert_batcher.submit(query, params)
+
+
 async def execute_update(query: str, params: tuple = ()) -> int:
     """Execute an UPDATE/DELETE and return the number of rows affected."""
     db = await get_db()
     cursor = await db.execute(query, params)
-    await db.commit()
+    await commit_db(db)
     return cursor.rowcount
 
 
+async def execute_returning(query: str, params: tuple = ()) -> Optional[dict]:
+    """
+    Execute a write with a RETURNING clause, commit, and return the first
+    returned row as dict (None if no row was affected).
+    """
+    db = await get_db()
+    cursor = await db.execute(query, params)
+    rows = await cursor.fetchall()
+    await commit_db(db)
+    return dict(rows[0]) if rows else None
+
+
 def get_paper_dir(folder_name: str) -> Path:
     """Return the absolute path to a paper's folder inside the library."""
     return LIBRARY_ROOT / folder_name
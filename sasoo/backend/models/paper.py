@@ -7,7 +7,7 @@ from typing import Optional
 import json
 
 
-@dataclass
+@dataclass(slots=True)
 class FigureReference:
     """A reference to a figure in the paper text (e.g., 'As shown in Fig. 1A...')."""
     text: str  # The sentence or context containing the reference
@@ -15,7 +15,7 @@ class FigureReference:
     figure_label: str  # e.g., "1", "1A", "1B"
 
 
-@dataclass
+@dataclass(slots=True)
 class SubCaption:
     """Represents a sub-figure caption (e.g., (A), (B), (C))."""
     label: str  # e.g., "A", "B", "C"
@@ -23,7 +23,7 @@ class SubCaption:
     references: list[FigureReference] = field(default_factory=list)  # In-text mentions
 
 
-@dataclass
+@dataclass(slots=True)
 class StructuredCaption:
     """Structured caption with title and sub-captions."""
     title: str  # Main figure title (e.g., "Optical setup and measurements")
@@ -12,16 +12,19 @@ Config: <project>/library/config.json  ->  { "gemini_api_key": "..." }
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import json
 import logging
+import random
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Optional
 
+import httpx
 from google import genai
-from google.genai import types
+from google.genai import errors, types
 
 from services.pricing import calc_cost
 
@@ -40,11 +43,52 @@ MODEL_PRO_IMAGE = "gemini-3-pro-image-preview"
 
 # Thinking budget by level
 THINKING_BUDGETS: dict[str, int] = {
+    "none": 0,
     "minimal": 1024,
     "medium": 4096,
     "high": 8192,
 }
 
+# Image MIME types accepted by generate_multimodal
+IMAGE_MIME_TYPES: dict[str, str] = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+    ".bmp": "image/bmp",
+}
+
+# Images at least this large are uploaded once via the Files API and
+# referenced by URI afterwards; smaller ones are cheaper to inline.
+FILES_API_MIN_BYTES = 256 * 1024
+# Uploaded files expire after 48h; refresh a little before that.
+FILE_URI_TTL_S = 47 * 3600
+
+# (api_key, resolved path, mtime_ns, size) -> (file_uri, expires_at)
+_file_uri_cache: dict[tuple[str, str, int, int], tuple[str, float]] = {}
+
+# Retry policy for transient failures (rate limits, 5xx, network errors) in
+# GeminiClient._call; anything else fails on the first attempt
+CALL_MAX_ATTEMPTS = 4
+CALL_BACKOFF_BASE_S = 0.5
+CALL_BACKOFF_JITTER_S = 0.2
+_TRANSIENT_STATUS = {429, 500, 502, 503, 504}
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Return True if *exc* (or its cause) is worth retrying."""
+    err: Optional[BaseException] = exc
+    while err is not None:
+        if isinstance(err, errors.ServerError):
+            return True
+        if isinstance(err, errors.APIError):
+            return err.code in _TRANSIENT_STATUS
+        if isinstance(err, (httpx.TransportError, asyncio.TimeoutError, ConnectionError)):
+            return True
+        err = err.__cause__
+    return False
+
 
 # ---------------------------------------------------------------------------
 # Token / Cost tracking
@@ -259,9 +303,8 @@ class GeminiClient:
         )
 
         start = time.monotonic()
-        last_error: Optional[Exception] = None
 
-        for attempt in range(3):
+        for attempt in range(CALL_MAX_ATTEMPTS):
             try:
                 response = await self._client.aio.models.generate_content(
                     model=model,
@@ -270,20 +313,24 @@ class GeminiClient:
                 )
                 break
             except Exception as exc:
-                last_error = exc
+                if not _is_transient(exc):
+                    raise RuntimeError(f"Gemini call failed: {exc}") from exc
+                if attempt == CALL_MAX_ATTEMPTS - 1:
+                    raise RuntimeError(
+                        f"Gemini call failed after {CALL_MAX_ATTEMPTS} attempts: {exc}"
+                    ) from exc
+                delay = (
+                    (2 ** attempt) * CALL_BACKOFF_BASE_S
+                    + random.random() * CALL_BACKOFF_JITTER_S
+                )
                 logger.warning(
-                    "Gemini call attempt %d/%d failed: %s",
+                    "Gemini call attempt %d/%d failed, retrying in %.2fs: %s",
                     attempt + 1,
-                    3,
+                    CALL_MAX_ATTEMPTS,
+                    delay,
                     exc,
                 )
-                if attempt < 2:
-                    import asyncio
-                    await asyncio.sleep(2 ** attempt)
-        else:
-            raise RuntimeError(
-                f"Gemini call failed after 3 attempts: {last_error}"
-            ) from last_error
+                await asyncio.sleep(delay)
 
         latency_ms = (time.monotonic() - start) * 1000
 
@@ -922,20 +969,11 @@ class GeminiClient:
 
         for img_path in image_paths:
             path = Path(img_path)
-            if path.exists():
-                img_bytes = path.read_bytes()
-                # Determine mime type
-                suffix = path.suffix.lower()
-                mime_map = {
-                    ".png": "image/png",
-                    ".jpg": "image/jpeg",
-                    ".jpeg": "image/jpeg",
-                    ".gif": "image/gif",
-                    ".webp": "image/webp",
-                    ".bmp": "image/bmp",
-                }
-                mime_type = mime_map.get(suffix, "image/png")
-                parts.append(types.Part.from_bytes(data=img_bytes, mime_type=mime_type))
+            mime_type = IMAGE_MIME_TYPES.get(path.suffix.lower(), "image/png")
+            try:
+                parts.append(await self._image_part(path, mime_type))
+            except (FileNotFoundError, IsADirectoryError):
+                logger.warning("Skipping missing image: %s", path)
 
         content = [types.Content(parts=parts, role="user")]
 
@@ -949,6 +987,34 @@ class GeminiClient:
         )
         return response
 
+    async def _image_part(self, path: Path, mime_type: str) -> types.Part:
+        """
+        Build a content part for an image file.
+
+        Large images are uploaded through the Files API once and referenced
+        by URI on later calls (cached by path, mtime and size). Small images,
+        or any upload failure, fall back to inlining the bytes.
+        """
+        st = path.stat()
+        if st.st_size >= FILES_API_MIN_BYTES:
+            key = (self._api_key, str(path.resolve()), st.st_mtime_ns, st.st_size)
+            cached = _file_uri_cache.get(key)
+            if cached and cached[1] > time.time():
+                return types.Part.from_uri(file_uri=cached[0], mime_type=mime_type)
+            try:
+                uploaded = await self._client.aio.files.upload(
+                    file=str(path),
+                    config=types.UploadFileConfig(mime_type=mime_type),
+                )
+                _file_uri_cache[key] = (uploaded.uri, time.time() + FILE_URI_TTL_S)
+                return types.Part.from_uri(file_uri=uploaded.uri, mime_type=mime_type)
+            except Exception as exc:
+                logger.warning(
+                    "Files API upload failed for %s, inlining bytes: %s", path, exc
+                )
+
+        return types.Part.from_bytes(data=path.read_bytes(), mime_type=mime_type)
+
     # ------------------------------------------------------------------
     # Image-based generation (for sub-figure detection etc.)
     # ------------------------------------------------------------------
@@ -1,21 +1,85 @@
 """
 Sasoo - Naming Service
-Uses Gemini 3.0 Flash (minimal thinking) to generate human-readable names
+Uses Gemini 3.0 Flash (thinking disabled) to generate human-readable names
 for paper folders, figures, and PaperBanana illustrations.
 
-Fallback: UUID-based naming if Gemini fails.
+Transient Gemini errors (429/5xx) are retried by GeminiClient._call.
+Fallback: UUID-based naming if Gemini still fails.
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import re
 import uuid
-from typing import Optional
+from typing import Any, Optional
+
+# Optional: google-re2 gives linear-time DFA matching for the name
+# sanitizers. Their patterns spell out ASCII classes instead of \w, which
+# RE2 treats as ASCII-only but re treats as Unicode, so both engines
+# produce the same folder and figure names.
+try:
+    import re2 as _name_re
+except ImportError:
+    _name_re = re
 
 logger = logging.getLogger(__name__)
 
+# Title sanitization: ASCII titles are filtered with a C-level translate
+# table; non-ASCII titles keep the Unicode-aware regex path.
+_TITLE_DROP_TABLE = str.maketrans("", "", "".join(
+    chr(i) for i in range(128)
+    if not (chr(i).isalnum() or chr(i).isspace() or chr(i) in "-_")
+))
+_TITLE_UNSAFE = re.compile(r'[^\w\s-]')
+_TITLE_SEPARATORS = re.compile(r'[-\s]+')
+_NAME_UNSAFE = _name_re.compile(r'[^0-9A-Za-z_]')
+_NAME_UNDERSCORES = _name_re.compile(r'_+')
+
+# Shared client so the HTTP connection pool (DNS/TLS) is reused across calls
+_client: Any = None
+_warmup_task: Optional[asyncio.Task] = None
+
+
+def _get_client() -> Any:
+    """Return the shared GeminiClient, recreating it if the API key changed."""
+    global _client
+    from services.llm.gemini_client import GeminiClient, UsageTracker, _load_api_key
+
+    api_key = _load_api_key()
+    if _client is None or _client._api_key != api_key:
+        _client = GeminiClient(api_key=api_key)
+    else:
+        # Naming usage is only logged, never read back; start a fresh
+        # tracker per call so the long-lived client does not accumulate
+        # a record for every naming call of the server's lifetime
+        _client.usage = UsageTracker()
+    return _client
+
+
+async def _warmup() -> None:
+    """Prime the Gemini connection with a cheap models listing."""
+    try:
+        client = _get_client()
+        await client._client.aio.models.list(config={"page_size": 1})
+        logger.debug("Gemini naming client warmed up")
+    except Exception as exc:
+        logger.debug("Gemini warmup skipped: %s", exc)
+
+
+def _schedule_warmup() -> None:
+    """Start the warmup in the background if an event loop is running."""
+    global _warmup_task
+    if _warmup_task is not None:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    _warmup_task = loop.create_task(_warmup())
+
 
 async def generate_folder_name(
     title: str,
@@ -30,34 +94,28 @@ async def generate_folder_name(
     Format: {year}_{JournalAbbrev}_{ShortTitle}_{Domain}
     Example: "2024_NatPhoton_MetasurfLens_Optics"
 
+    ``abstract`` is accepted for API compatibility but no longer sent to the
+    model; title, journal and domain are enough for a filename.
+
     Falls back to UUID-based name on failure.
     """
     try:
-        from services.llm.gemini_client import GeminiClient, MODEL_FLASH
+        from services.llm.gemini_client import MODEL_FLASH
 
-        client = GeminiClient()
+        client = _get_client()
         prompt = (
-            "Generate a short, filesystem-safe folder name for this research paper.\n\n"
-            f"Title: {title}\n"
-            f"Year: {year or 'unknown'}\n"
-            f"Journal: {journal or 'unknown'}\n"
-            f"Domain: {domain or 'unknown'}\n"
-            f"Abstract (first 300 chars): {(abstract or '')[:300]}\n\n"
-            "Rules:\n"
-            "1. Format: {Year}_{JournalAbbrev}_{ShortTitle}_{Domain}\n"
-            "2. Use only ASCII alphanumeric and underscores\n"
-            "3. Abbreviate journal name (e.g., Nature Photonics -> NatPhoton)\n"
-            "4. ShortTitle should be 1-3 words in CamelCase capturing the main topic\n"
-            "5. Keep total length under 60 characters\n"
-            "6. If year is unknown, omit it\n"
-            "7. If journal is unknown, omit it\n\n"
-            "Return ONLY the folder name string, nothing else."
+            "Filesystem-safe folder name (<60 chars, ASCII, underscores, "
+            "format {Year}_{JournalAbbrev}_{ShortTitle}_{Domain}, "
+            "CamelCase 1-3 word ShortTitle, omit unknown parts): "
+            f"title={title!r} year={year or 'unknown'} "
+            f"journal={journal or 'unknown'} domain={domain or 'unknown'}. "
+            "Return just the name."
         )
 
         response = await client._call(
             model=MODEL_FLASH,
             contents=prompt,
-            thinking_level="minimal",
+            thinking_level="none",
             phase="naming",
         )
         raw_name = client._response_text(response).strip()
@@ -67,8 +125,7 @@ async def generate_folder_name(
         raw_name = raw_name.split('\n')[0].strip()
 
         # Validate: only allow safe filesystem characters
-        sanitized = re.sub(r'[^\w]', '_', raw_name)
-        sanitized = re.sub(r'_+', '_', sanitized).strip('_')
+        sanitized = _sanitize_name(raw_name)
 
         if sanitized and len(sanitized) >= 5:
             logger.info("Generated folder name: %s", sanitized)
@@ -89,15 +146,17 @@ async def generate_figure_names(
     Input: [{"figure_num": "p2_img1", "caption": "SEM cross-section...", "page": 2}]
     Output: ["fig1_SEM_cross_section", "fig2_transmission_spectrum"]
 
-    Falls back to original figure_num on failure.
+    If the model returns too many or too few names, extras are dropped and
+    missing entries keep their original figure_num. Falls back to original
+    figure_num for the whole batch only when the response can't be parsed.
     """
     if not captions_and_pages:
         return []
 
     try:
-        from services.llm.gemini_client import GeminiClient, MODEL_FLASH
+        from services.llm.gemini_client import MODEL_FLASH
 
-        client = GeminiClient()
+        client = _get_client()
 
         figures_desc = "\n".join(
             f"- Figure '{f.get('figure_num', '?')}': {f.get('caption', 'no caption')}"
@@ -105,22 +164,16 @@ async def generate_figure_names(
         )
 
         prompt = (
-            "Generate short, descriptive filenames for these research paper figures.\n\n"
-            f"Figures:\n{figures_desc}\n\n"
-            "Rules:\n"
-            "1. Format: fig{N}_{short_description}\n"
-            "2. Use only ASCII lowercase, digits, and underscores\n"
-            "3. Description should be 2-4 words capturing what the figure shows\n"
-            "4. Keep each name under 40 characters\n"
-            "5. Number figures sequentially (fig1, fig2, ...)\n\n"
-            "Return a JSON array of strings, one per figure, in the same order.\n"
-            "Example: [\"fig1_sem_cross_section\", \"fig2_transmission_spectrum\"]"
+            "Filenames for these paper figures (fig{N}_{2-4 word description}, "
+            "ASCII lowercase/digits/underscores, <40 chars, numbered in order):\n"
+            f"{figures_desc}\n"
+            "Return a JSON array of strings, one per figure, in the same order."
         )
 
         response = await client._call(
             model=MODEL_FLASH,
             contents=prompt,
-            thinking_level="minimal",
+            thinking_level="none",
             phase="naming",
             response_mime_type="application/json",
         )
@@ -128,13 +181,24 @@ async def generate_figure_names(
 
         # Parse JSON array
         names = json.loads(text)
-        if isinstance(names, list) and len(names) == len(captions_and_pages):
+        if isinstance(names, list) and names:
+            expected = len(captions_and_pages)
+            if len(names) != expected:
+                # Off-by-N output: keep the good names, fill/trim the rest
+                logger.warning(
+                    "Figure naming returned %d names for %d figures, repairing",
+                    len(names),
+                    expected,
+                )
+                names = names[:expected]
+
             # Sanitize each name
             result = []
             for name in names:
-                safe = re.sub(r'[^\w]', '_', str(name).lower())
-                safe = re.sub(r'_+', '_', safe).strip('_')
+                safe = _sanitize_name(str(name).lower())
                 result.append(safe if safe else f"fig{len(result)+1}")
+            for f in captions_and_pages[len(result):]:
+                result.append(f.get("figure_num", f"fig{len(result)+1}"))
             logger.info("Generated %d figure names", len(result))
             return result
 
@@ -157,30 +221,24 @@ async def generate_paperbanana_name(
     Falls back to sanitized title on failure.
     """
     try:
-        from services.llm.gemini_client import GeminiClient, MODEL_FLASH
+        from services.llm.gemini_client import MODEL_FLASH
 
-        client = GeminiClient()
+        client = _get_client()
         prompt = (
-            "Generate a short, descriptive filename for this scientific illustration.\n\n"
-            f"Title: {title}\n"
-            f"Description: {description or 'N/A'}\n\n"
-            "Rules:\n"
-            "1. Use only ASCII lowercase, digits, and underscores\n"
-            "2. 2-4 words describing what the illustration shows\n"
-            "3. Keep under 40 characters\n"
-            "4. Do NOT include file extension\n\n"
-            "Return ONLY the filename string, nothing else."
+            "Filename for this scientific illustration (2-4 words, ASCII "
+            "lowercase/digits/underscores, <40 chars, no extension): "
+            f"title={title!r} description={description or 'N/A'!r}. "
+            "Return just the filename."
         )
 
         response = await client._call(
             model=MODEL_FLASH,
             contents=prompt,
-            thinking_level="minimal",
+            thinking_level="none",
             phase="naming",
         )
         raw = client._response_text(response).strip().strip('`"\'').split('\n')[0]
-        sanitized = re.sub(r'[^\w]', '_', raw.lower())
-        sanitized = re.sub(r'_+', '_', sanitized).strip('_')
+        sanitized = _sanitize_name(raw.lower())
 
         if sanitized and len(sanitized) >= 3:
             logger.info("Generated PaperBanana name: %s", sanitized)
@@ -190,16 +248,31 @@ async def generate_paperbanana_name(
         logger.warning("PaperBanana name generation failed: %s", exc)
 
     # Fallback
-    safe = re.sub(r'[^\w\s-]', '', title).strip()
-    safe = re.sub(r'[-\s]+', '_', safe).lower()
+    safe = _sanitize_title(title).lower()
     return safe[:40] if safe else "illustration"
 
 
+def _sanitize_name(raw: str) -> str:
+    """Replace all but ASCII letters, digits and underscores in a model-generated name."""
+    return _NAME_UNDERSCORES.sub('_', _NAME_UNSAFE.sub('_', raw)).strip('_')
+
+
+def _sanitize_title(title: str) -> str:
+    """Strip punctuation from a title and join words with underscores."""
+    if title.isascii():
+        safe = title.translate(_TITLE_DROP_TABLE).strip()
+    else:
+        safe = _TITLE_UNSAFE.sub('', title).strip()
+    return _TITLE_SEPARATORS.sub('_', safe)
+
+
 def _fallback_folder_name(title: str, year: Optional[int] = None) -> str:
     """Generate a fallback folder name with UUID suffix for uniqueness."""
     suffix = uuid.uuid4().hex[:8]
-    safe_title = re.sub(r'[^\w\s-]', '', title).strip()
-    safe_title = re.sub(r'[-\s]+', '_', safe_title)[:40]
+    safe_title = _sanitize_title(title)[:40]
     if year:
         return f"{year}_{safe_title}_{suffix}"
     return f"{safe_title}_{suffix}"
+
+
+_schedule_warmup()
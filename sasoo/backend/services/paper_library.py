@@ -7,23 +7,339 @@ cost tracking per paper and monthly aggregate, and library statistics.
 
 from __future__ import annotations
 
+import asyncio
+import base64
+import copy
+import functools
 import json
 import logging
+import re
+import shutil
+import time
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Awaitable, Callable, Optional
 
 from models.database import (
-    execute_insert,
+    execute_insert_batched,
+    execute_returning,
     execute_update,
-    fetch_all,
+    fetch_all_ro,
     fetch_one,
+    fetch_one_ro,
     get_db,
     get_paper_dir,
+    write_version,
 )
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps(value: Any) -> str:
+        # orjson emits UTF-8 bytes and never escapes non-ASCII
+        return orjson.dumps(value).decode()
+
+except ImportError:  # orjson is optional; stdlib json is the fallback
+    _json_loads = json.loads
+
+    def _json_dumps(value: Any) -> str:
+        return json.dumps(value, ensure_ascii=False)
+
 logger = logging.getLogger(__name__)
 
+# SQL expression quoting a legacy comma-separated tags value ("a, b") as a
+# JSON array of the raw comma-split pieces
+_LEGACY_TAGS_JSON = (
+    r"""'["' || replace(replace(replace(replace(replace(replace({col}, """
+    r"""'\', '\\'), '"', '\"'), char(9), '\t'), char(10), '\n'), char(13), '\r'), """
+    r"""',', '","') || '"]'"""
+)
+_TRIM_CHARS = "' ' || char(9) || char(10) || char(13)"
+
+# SQL expression yielding a column's tags as a JSON array, safe to pass to
+# json_each(). Mirrors _parse_tags_str: JSON arrays pass through, a value
+# without commas is a single tag, and anything else is read as legacy
+# comma-separated tags, trimmed with empty pieces dropped; NULL/blank
+# gives '[]'.
+_TAGS_ARRAY = (
+    "CASE WHEN json_valid({col}) AND json_type({col}) = 'array' THEN {col} "
+    "WHEN instr({col}, ',') = 0 THEN "
+    f"CASE WHEN trim({{col}}, {_TRIM_CHARS}) <> '' THEN json_array({{col}}) ELSE '[]' END "
+    f"WHEN json_valid({_LEGACY_TAGS_JSON}) THEN ("
+    f"SELECT json_group_array(trim(value, {_TRIM_CHARS})) "
+    f"FROM json_each({_LEGACY_TAGS_JSON}) WHERE trim(value, {_TRIM_CHARS}) <> '') "
+    "ELSE '[]' END"
+)
+
+# Column weights for FTS5 ranking: title, authors, journal, tags, notes
+FTS_RANK_FUNCTION = "bm25(10.0, 5.0, 2.0, 1.0, 1.0)"
+
+# FTS5 operators that mean the user wrote a raw MATCH expression
+_FTS_OPERATOR_RE = re.compile(r" (?:AND|OR|NOT) | NEAR/", re.IGNORECASE)
+
+# Atomic tag edits with JSON1. Legacy comma-separated values are read via
+# _TAGS_ARRAY and written back as a JSON array. Each matches no row (so the
+# caller falls back to read-modify-write) when the paper is missing or the
+# edit would be a no-op.
+_ADD_TAG_SQL = f"""
+UPDATE papers
+SET tags = json_insert({_TAGS_ARRAY.format(col="tags")}, '$[#]', ?)
+WHERE id = ?
+  AND NOT EXISTS (
+      SELECT 1 FROM json_each({_TAGS_ARRAY.format(col="tags")}) WHERE value = ?
+  )
+RETURNING tags
+"""
+
+_REMOVE_TAG_SQL = f"""
+UPDATE papers
+SET tags = (
+    SELECT json_group_array(value)
+    FROM json_each({_TAGS_ARRAY.format(col="tags")})
+    WHERE value IS NOT ?
+)
+WHERE id = ?
+  AND EXISTS (
+      SELECT 1 FROM json_each({_TAGS_ARRAY.format(col="tags")}) WHERE value = ?
+  )
+RETURNING tags
+"""
+
+# Library statistics in a single query; each row is tagged with its kind
+_STATS_SQL = """
+SELECT 'total' AS kind, NULL AS grp, COUNT(*) AS v1, NULL AS v2, NULL AS v3 FROM papers
+UNION ALL
+SELECT 'status', status, COUNT(*), NULL, NULL FROM papers GROUP BY status
+UNION ALL
+SELECT 'domain', domain, COUNT(*), NULL, NULL FROM papers GROUP BY domain
+UNION ALL
+SELECT 'agent', agent_used, COUNT(*), NULL, NULL FROM papers GROUP BY agent_used
+UNION ALL
+SELECT 'year', year, COUNT(*), NULL, NULL FROM papers WHERE year IS NOT NULL GROUP BY year
+UNION ALL
+SELECT 'cost', NULL, SUM(cost_usd), SUM(tokens_in), SUM(tokens_out) FROM analysis_results
+UNION ALL
+SELECT 'analyses', NULL, COUNT(*), COUNT(DISTINCT paper_id), NULL FROM analysis_results
+UNION ALL
+SELECT 'figures', NULL, COUNT(*), NULL, NULL FROM figures
+"""
+
+# Monthly cost rollup by model, phase and day over [start, end)
+_MONTHLY_COST_SQL = """
+SELECT 'model' AS kind, COALESCE(model_used, 'unknown') AS grp,
+       SUM(cost_usd) AS cost, SUM(tokens_in) AS tokens_in,
+       SUM(tokens_out) AS tokens_out, COUNT(*) AS cnt
+FROM analysis_results WHERE created_at >= ? AND created_at < ?
+GROUP BY 2
+UNION ALL
+SELECT 'phase', COALESCE(phase, 'unknown'), SUM(cost_usd), NULL, NULL, COUNT(*)
+FROM analysis_results WHERE created_at >= ? AND created_at < ?
+GROUP BY 2
+UNION ALL
+SELECT 'day', COALESCE(NULLIF(substr(created_at, 1, 10), ''), 'unknown'),
+       SUM(cost_usd), NULL, NULL, COUNT(*)
+FROM analysis_results WHERE created_at >= ? AND created_at < ?
+GROUP BY 2
+ORDER BY 1, 2
+"""
+
+
+@functools.lru_cache(maxsize=256)
+def _month_bounds(year: int, month: int) -> tuple[str, str, str]:
+    """Return ("YYYY-MM", first day, first day of next month) as ISO strings."""
+    carry, next_month = divmod(month, 12)
+    return (
+        f"{year}-{month:02d}",
+        f"{year}-{month:02d}-01",
+        f"{year + carry}-{next_month + 1:02d}-01",
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_tags_str(tags_value: str) -> tuple[str, ...]:
+    """
+    Parse a stored tags string (JSON array, or legacy comma-separated).
+    Memoized: the same tag strings repeat across papers and page loads.
+    Returns a tuple so cached values can't be mutated by callers.
+    """
+    try:
+        parsed = _json_loads(tags_value)
+        if isinstance(parsed, list):
+            return tuple(parsed)
+    except (ValueError, TypeError):
+        pass
+    # Might be comma-separated
+    if "," in tags_value:
+        return tuple(t.strip() for t in tags_value.split(",") if t.strip())
+    return (tags_value,) if tags_value.strip() else ()
+
+
+# ---------------------------------------------------------------------------
+# Keyset pagination cursors
+# ---------------------------------------------------------------------------
+
+def _encode_cursor(*values: Any) -> str:
+    """Encode the last row's sort key as an opaque, URL-safe cursor."""
+    return base64.urlsafe_b64encode(_json_dumps(values).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> list[Any]:
+    """Decode a cursor produced by _encode_cursor."""
+    try:
+        values = _json_loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError) as exc:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from exc
+    if not isinstance(values, list) or len(values) != 2:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return values
+
+
+def _keyset_condition(
+    column: str, order: str, value: Any, row_id: int
+) -> tuple[str, tuple]:
+    """
+    WHERE fragment selecting rows after (value, row_id) in
+    ``ORDER BY column {order}, id {order}``. SQLite sorts NULLs first
+    ascending and last descending, so NULL sort values are handled
+    explicitly instead of being dropped by the row-value comparison.
+    """
+    if order == "DESC":
+        if value is None:
+            return f"({column} IS NULL AND id < ?)", (row_id,)
+        return f"(({column}, id) < (?, ?) OR {column} IS NULL)", (value, row_id)
+    if value is None:
+        return f"(({column} IS NULL AND id > ?) OR {column} IS NOT NULL)", (row_id,)
+    return f"(({column}, id) > (?, ?))", (value, row_id)
+
+
+
+# list_papers SQL, precomputed for every filter/sort combination so the
+# exact statement text repeats and SQLite's statement cache is reused.
+_LIST_SORT_COLUMNS = ("created_at", "title", "year", "journal", "status", "analyzed_at")
+_LIST_FILTERS = (
+    ("domain", "domain = ?"),
+    ("status", "status = ?"),
+    ("year", "year = ?"),
+    # Exact tag match via the indexed paper_tags table
+    ("tag", "id IN (SELECT paper_id FROM paper_tags WHERE tag = ?)"),
+)
+
+
+def _list_where(mask: int) -> str:
+    """WHERE body for the filters whose bits are set in ``mask``."""
+    conditions = [frag for i, (_, frag) in enumerate(_LIST_FILTERS) if mask & (1 << i)]
+    return " AND ".join(conditions) if conditions else "1=1"
+
+
+_LIST_COUNT_SQL = {
+    mask: f"SELECT COUNT(*) as cnt FROM papers WHERE {_list_where(mask)}"
+    for mask in range(1 << len(_LIST_FILTERS))
+}
+
+_LIST_PAGE_SQL = {
+    (mask, sort_by, sort_order): (
+        f"SELECT *, COUNT(*) OVER () AS _total FROM papers "
+        f"WHERE {_list_where(mask)} "
+        f"ORDER BY {sort_by} {sort_order}, id {sort_order} LIMIT ? OFFSET ?"
+    )
+    for mask in range(1 << len(_LIST_FILTERS))
+    for sort_by in _LIST_SORT_COLUMNS
+    for sort_order in ("ASC", "DESC")
+}
+
+
+@functools.lru_cache(maxsize=512)
+def _list_seek_sql(mask: int, sort_by: str, sort_order: str, seek: str) -> str:
+    """Keyset-page SQL; ``seek`` is one of the few _keyset_condition fragments."""
+    return (
+        f"SELECT * FROM papers WHERE {_list_where(mask)} AND {seek} "
+        f"ORDER BY {sort_by} {sort_order}, id {sort_order} LIMIT ?"
+    )
+
+# ---------------------------------------------------------------------------
+# Read-result cache
+# ---------------------------------------------------------------------------
+
+RESULT_CACHE_SIZE = 512
+RESULT_CACHE_TTL_S = 60.0
+
+_MISS = object()
+
+
+class _ResultCache:
+    """
+    Bounded LRU cache with a per-entry TTL for read-query results.
+
+    Keys include this cache's version, bumped by PaperLibrary writes, and
+    models.database.write_version(), bumped by every commit on the shared
+    connection (including the API and pipeline writes), so a read that
+    started before a write can never be served after it. The TTL only
+    bounds staleness from writes by other processes.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version = 0
+        self._data: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Any) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return _MISS
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return _MISS
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key: Any, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self) -> None:
+        self.version += 1
+        self._data.clear()
+
+
+_result_cache = _ResultCache(RESULT_CACHE_SIZE, RESULT_CACHE_TTL_S)
+
+
+def _cached_read(
+    method: Callable[..., Awaitable[Any]],
+) -> Callable[..., Awaitable[Any]]:
+    """
+    Cache a read method's result keyed on its arguments and cache version.
+
+    Hits return a shallow copy of the cached result: callers may rebind its
+    top-level keys or items, but must not mutate the rows nested inside,
+    which are shared with the cache.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        key = (
+            method.__name__,
+            _result_cache.version,
+            write_version(),
+            args,
+            tuple(sorted(kwargs.items())),
+        )
+        cached = _result_cache.get(key)
+        if cached is not _MISS:
+            return copy.copy(cached)
+        result = await method(self, *args, **kwargs)
+        _result_cache.put(key, result)
+        return copy.copy(result)
+
+    return wrapper
+
 
 class PaperLibrary:
     """
@@ -42,6 +358,9 @@ class PaperLibrary:
         """
         db = await get_db()
         try:
+            # ``tags`` is indexed as stored JSON: the unicode61 tokenizer
+            # treats brackets, quotes and commas as separators, so only the
+            # tag words themselves become tokens.
             await db.executescript("""
                 CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
                     title, authors, journal, tags, notes,
@@ -67,17 +386,78 @@ class PaperLibrary:
                     VALUES (new.id, new.title, new.authors, new.journal, new.tags, new.notes);
                 END;
             """)
+            # Persist weighted BM25 as the table's rank function so
+            # "ORDER BY rank" keeps FTS5's fast path with better ordering
+            await db.execute(
+                "INSERT INTO papers_fts(papers_fts, rank) VALUES ('rank', ?)",
+                (FTS_RANK_FUNCTION,),
+            )
             await db.commit()
             logger.info("PaperLibrary: FTS5 table and triggers ensured.")
         except Exception as exc:
             logger.warning("PaperLibrary: FTS5 setup failed (may already exist): %s", exc)
 
+        await self._ensure_tag_table(db)
+
+    async def _ensure_tag_table(self, db: Any) -> None:
+        """
+        Create the normalized paper_tags table (one row per paper/tag) and
+        triggers that derive it from ``papers.tags`` (a JSON array or a
+        legacy comma-separated string, see _TAGS_ARRAY), so tag filters use
+        an index instead of scanning the tags text. The triggers are
+        recreated on every start so existing databases pick up changes to
+        their definition.
+        """
+        try:
+            await db.executescript(f"""
+                CREATE TABLE IF NOT EXISTS paper_tags (
+                    paper_id INTEGER NOT NULL,
+                    tag TEXT NOT NULL,
+                    PRIMARY KEY (paper_id, tag)
+                ) WITHOUT ROWID;
+
+                CREATE INDEX IF NOT EXISTS idx_paper_tags_tag ON paper_tags(tag);
+
+                DROP TRIGGER IF EXISTS papers_tags_ai;
+                DROP TRIGGER IF EXISTS papers_tags_ad;
+                DROP TRIGGER IF EXISTS papers_tags_au;
+
+                CREATE TRIGGER papers_tags_ai AFTER INSERT ON papers BEGIN
+                    INSERT OR IGNORE INTO paper_tags(paper_id, tag)
+                    SELECT new.id, value FROM json_each({_TAGS_ARRAY.format(col="new.tags")})
+                    WHERE type = 'text';
+                END;
+
+                CREATE TRIGGER papers_tags_ad AFTER DELETE ON papers BEGIN
+                    DELETE FROM paper_tags WHERE paper_id = old.id;
+                END;
+
+                CREATE TRIGGER papers_tags_au AFTER UPDATE OF tags ON papers BEGIN
+                    DELETE FROM paper_tags WHERE paper_id = old.id;
+                    INSERT OR IGNORE INTO paper_tags(paper_id, tag)
+                    SELECT new.id, value FROM json_each({_TAGS_ARRAY.format(col="new.tags")})
+                    WHERE type = 'text';
+                END;
+
+                -- Backfill rows the current triggers did not index (idempotent)
+                INSERT OR IGNORE INTO paper_tags(paper_id, tag)
+                SELECT papers.id, j.value
+                FROM papers, json_each({_TAGS_ARRAY.format(col="papers.tags")}) AS j
+                WHERE papers.tags IS NOT NULL AND j.type = 'text';
+            """)
+            await db.commit()
+        except Exception as exc:
+            logger.warning("PaperLibrary: paper_tags setup failed: %s", exc)
+
     async def rebuild_fts_index(self) -> None:
         """Rebuild the FTS index from scratch. Useful after bulk imports."""
         db = await get_db()
         try:
             await db.execute("INSERT INTO papers_fts(papers_fts) VALUES ('rebuild')")
+            # Merge the b-tree segments the rebuild left behind
+            await db.execute("INSERT INTO papers_fts(papers_fts) VALUES ('optimize')")
             await db.commit()
+            _result_cache.invalidate()
             logger.info("PaperLibrary: FTS index rebuilt.")
         except Exception as exc:
             logger.error("PaperLibrary: FTS rebuild failed: %s", exc)
@@ -117,9 +497,9 @@ class PaperLibrary:
         Returns:
             The new paper ID.
         """
-        tags_json = json.dumps(tags, ensure_ascii=False) if tags else None
+        tags_json = _json_dumps(tags) if tags else None
 
-        paper_id = await execute_insert(
+        paper_id = await execute_insert_batched(
             """
             INSERT INTO papers
                 (title, authors, year, journal, doi, domain, agent_used,
@@ -130,6 +510,7 @@ class PaperLibrary:
              folder_name, tags_json, notes),
         )
 
+        _result_cache.invalidate()
         logger.info("PaperLibrary: Created paper %d: %s", paper_id, title)
         return paper_id
 
@@ -144,6 +525,7 @@ class PaperLibrary:
             row["tags"] = self._parse_tags(row.get("tags"))
         return row
 
+    @_cached_read
     async def list_papers(
         self,
         page: int = 1,
@@ -154,57 +536,56 @@ class PaperLibrary:
         tag: Optional[str] = None,
         sort_by: str = "created_at",
         sort_order: str = "DESC",
+        cursor: Optional[str] = None,
     ) -> dict[str, Any]:
         """
         List papers with filtering, pagination, and sorting.
 
+        Pass the previous response's ``next_cursor`` as ``cursor`` to seek
+        directly to the following page (keyset pagination) instead of
+        skipping ``(page - 1) * page_size`` rows; ``page`` is then only
+        echoed back.
+
         Returns:
-            Dict with keys: papers, total, page, page_size.
+            Dict with keys: papers, total, page, page_size, next_cursor.
         """
-        conditions: list[str] = []
         params: list[Any] = []
-
-        if domain:
-            conditions.append("domain = ?")
-            params.append(domain)
-        if status:
-            conditions.append("status = ?")
-            params.append(status)
-        if year:
-            conditions.append("year = ?")
-            params.append(year)
-        if tag:
-            # Search inside JSON array stored as text
-            conditions.append("tags LIKE ?")
-            params.append(f"%{tag}%")
-
-        where_clause = " AND ".join(conditions) if conditions else "1=1"
+        mask = 0
+        for i, value in enumerate((domain, status, year, tag)):
+            if value:
+                mask |= 1 << i
+                params.append(value)
 
         # Validate sort column
-        valid_sorts = {"created_at", "title", "year", "journal", "status", "analyzed_at"}
-        if sort_by not in valid_sorts:
+        if sort_by not in _LIST_SORT_COLUMNS:
             sort_by = "created_at"
-        if sort_order.upper() not in ("ASC", "DESC"):
+        sort_order = sort_order.upper()
+        if sort_order not in ("ASC", "DESC"):
             sort_order = "DESC"
 
-        # Count
-        count_row = await fetch_one(
-            f"SELECT COUNT(*) as cnt FROM papers WHERE {where_clause}",
-            tuple(params),
-        )
-        total = count_row["cnt"] if count_row else 0
+        count_query = _LIST_COUNT_SQL[mask]
+        if cursor:
+            # Keyset: seek past the previous page's last row
+            last_value, last_id = _decode_cursor(cursor)
+            seek, seek_params = _keyset_condition(sort_by, sort_order, last_value, last_id)
+            rows = await fetch_all_ro(
+                _list_seek_sql(mask, sort_by, sort_order, seek),
+                tuple(params) + seek_params + (page_size,),
+            )
+            count_row = await fetch_one_ro(count_query, tuple(params))
+            total = count_row["cnt"] if count_row else 0
+        else:
+            # Fetch page with total count in the same pass
+            offset = (page - 1) * page_size
+            rows = await fetch_all_ro(
+                _LIST_PAGE_SQL[(mask, sort_by, sort_order)],
+                tuple(params) + (page_size, offset),
+            )
+            total = await self._pop_total(rows, offset, count_query, tuple(params))
 
-        # Fetch page
-        offset = (page - 1) * page_size
-        rows = await fetch_all(
-            f"""
-            SELECT * FROM papers
-            WHERE {where_clause}
-            ORDER BY {sort_by} {sort_order}
-            LIMIT ? OFFSET ?
-            """,
-            tuple(params) + (page_size, offset),
-        )
+        next_cursor = None
+        if len(rows) == page_size:
+            next_cursor = _encode_cursor(rows[-1][sort_by], rows[-1]["id"])
 
         # Parse tags
         for row in rows:
@@ -215,6 +596,7 @@ class PaperLibrary:
             "total": total,
             "page": page,
             "page_size": page_size,
+            "next_cursor": next_cursor,
         }
 
     # ------------------------------------------------------------------
@@ -237,7 +619,7 @@ class PaperLibrary:
 
         # Handle tags specially
         if "tags" in fields and isinstance(fields["tags"], list):
-            fields["tags"] = json.dumps(fields["tags"], ensure_ascii=False)
+            fields["tags"] = _json_dumps(fields["tags"])
 
         set_parts: list[str] = []
         params: list[Any] = []
@@ -251,6 +633,7 @@ class PaperLibrary:
             f"UPDATE papers SET {', '.join(set_parts)} WHERE id = ?",
             tuple(params),
         )
+        _result_cache.invalidate()
         logger.info("PaperLibrary: Updated paper %d, fields: %s", paper_id, list(fields.keys()))
         return affected
 
@@ -269,36 +652,40 @@ class PaperLibrary:
         Returns:
             True if deleted, False if not found.
         """
-        paper = await self.get_paper(paper_id)
+        # Delete from DB (CASCADE deletes analysis_results and figures)
+        paper = await execute_returning(
+            "DELETE FROM papers WHERE id = ? RETURNING folder_name", (paper_id,)
+        )
         if not paper:
             return False
-
-        # Delete from DB (CASCADE deletes analysis_results and figures)
-        affected = await execute_update("DELETE FROM papers WHERE id = ?", (paper_id,))
+        _result_cache.invalidate()
 
         # Delete files
         if delete_files and paper.get("folder_name"):
-            import shutil
             paper_path = get_paper_dir(paper["folder_name"])
-            if paper_path.exists():
-                try:
-                    shutil.rmtree(paper_path)
-                    logger.info("PaperLibrary: Deleted folder %s", paper_path)
-                except Exception as exc:
-                    logger.error("PaperLibrary: Failed to delete folder: %s", exc)
+            try:
+                # Disk-bound; keep it off the event loop
+                await asyncio.to_thread(shutil.rmtree, paper_path)
+                logger.info("PaperLibrary: Deleted folder %s", paper_path)
+            except FileNotFoundError:
+                pass
+            except Exception as exc:
+                logger.error("PaperLibrary: Failed to delete folder: %s", exc)
 
         logger.info("PaperLibrary: Deleted paper %d", paper_id)
-        return affected > 0
+        return True
 
     # ------------------------------------------------------------------
     # Search (FTS5)
     # ------------------------------------------------------------------
 
+    @_cached_read
     async def search(
         self,
         query: str,
         page: int = 1,
         page_size: int = 20,
+        cursor: Optional[str] = None,
     ) -> dict[str, Any]:
         """
         Full-text search using SQLite FTS5.
@@ -307,39 +694,55 @@ class PaperLibrary:
             query: Search query string (supports FTS5 syntax).
             page: Page number (1-based).
             page_size: Results per page.
+            cursor: ``next_cursor`` from the previous page; seeks by
+                (rank, rowid) instead of using OFFSET.
 
         Returns:
-            Dict with keys: papers, total, page, page_size.
+            Dict with keys: papers, total, page, page_size, next_cursor.
         """
         # Sanitize query for FTS5
         safe_query = self._sanitize_fts_query(query)
+        seek = _decode_cursor(cursor) if cursor else None
+        count_query = "SELECT COUNT(*) as cnt FROM papers_fts WHERE papers_fts MATCH ?"
 
         try:
-            # Count
-            count_row = await fetch_one(
-                """
-                SELECT COUNT(*) as cnt
-                FROM papers_fts
-                WHERE papers_fts MATCH ?
-                """,
-                (safe_query,),
-            )
-            total = count_row["cnt"] if count_row else 0
-
-            # Fetch results
-            offset = (page - 1) * page_size
-            rows = await fetch_all(
-                """
-                SELECT p.*,
-                       rank
-                FROM papers_fts
-                JOIN papers p ON p.id = papers_fts.rowid
-                WHERE papers_fts MATCH ?
-                ORDER BY rank
-                LIMIT ? OFFSET ?
-                """,
-                (safe_query, page_size, offset),
-            )
+            if seek:
+                # Keyset: seek past the previous page's last (rank, rowid)
+                rows = await fetch_all_ro(
+                    """
+                    SELECT p.*,
+                           rank
+                    FROM papers_fts
+                    JOIN papers p ON p.id = papers_fts.rowid
+                    WHERE papers_fts MATCH ? AND (rank, papers_fts.rowid) > (?, ?)
+                    ORDER BY rank, papers_fts.rowid
+                    LIMIT ?
+                    """,
+                    (safe_query, seek[0], seek[1], page_size),
+                )
+                count_row = await fetch_one_ro(count_query, (safe_query,))
+                total = count_row["cnt"] if count_row else 0
+            else:
+                # Fetch results with total count in the same pass
+                offset = (page - 1) * page_size
+                rows = await fetch_all_ro(
+                    """
+                    SELECT p.*,
+                           rank,
+                           COUNT(*) OVER () AS _total
+                    FROM papers_fts
+                    JOIN papers p ON p.id = papers_fts.rowid
+                    WHERE papers_fts MATCH ?
+                    ORDER BY rank, papers_fts.rowid  -- rank is FTS_RANK_FUNCTION
+                    LIMIT ? OFFSET ?
+                    """,
+                    (safe_query, page_size, offset),
+                )
+                total = await self._pop_total(rows, offset, count_query, (safe_query,))
+
+            next_cursor = None
+            if len(rows) == page_size:
+                next_cursor = _encode_cursor(rows[-1]["rank"], rows[-1]["id"])
 
             for row in rows:
                 row["tags"] = self._parse_tags(row.get("tags"))
@@ -350,6 +753,7 @@ class PaperLibrary:
                 "total": total,
                 "page": page,
                 "page_size": page_size,
+                "next_cursor": next_cursor,
             }
 
         except Exception as exc:
@@ -360,7 +764,10 @@ class PaperLibrary:
     async def _search_fallback(
         self, query: str, page: int, page_size: int
     ) -> dict[str, Any]:
-        """LIKE-based fallback search when FTS5 is not available."""
+        """
+        LIKE-based fallback search when FTS5 is not available.
+        Uses OFFSET paging only; ``next_cursor`` is always None.
+        """
         like_pattern = f"%{query}%"
         conditions = (
             "title LIKE ? OR authors LIKE ? OR journal LIKE ? "
@@ -368,22 +775,19 @@ class PaperLibrary:
         )
         params = (like_pattern,) * 5
 
-        count_row = await fetch_one(
-            f"SELECT COUNT(*) as cnt FROM papers WHERE {conditions}",
-            params,
-        )
-        total = count_row["cnt"] if count_row else 0
-
         offset = (page - 1) * page_size
-        rows = await fetch_all(
+        rows = await fetch_all_ro(
             f"""
-            SELECT * FROM papers
+            SELECT *, COUNT(*) OVER () AS _total FROM papers
             WHERE {conditions}
             ORDER BY created_at DESC
             LIMIT ? OFFSET ?
             """,
             params + (page_size, offset),
         )
+        total = await self._pop_total(
+            rows, offset, f"SELECT COUNT(*) as cnt FROM papers WHERE {conditions}", params
+        )
 
         for row in rows:
             row["tags"] = self._parse_tags(row.get("tags"))
@@ -393,6 +797,7 @@ class PaperLibrary:
             "total": total,
             "page": page,
             "page_size": page_size,
+            "next_cursor": None,
         }
 
     # ------------------------------------------------------------------
@@ -402,26 +807,32 @@ class PaperLibrary:
     async def add_tag(self, paper_id: int, tag: str) -> list[str]:
         """
         Add a tag to a paper. Returns the updated tag list.
-        """
-        paper = await self.get_paper(paper_id)
-        if not paper:
-            raise ValueError(f"Paper {paper_id} not found")
-
-        tags = paper.get("tags", []) or []
-        if isinstance(tags, str):
-            tags = self._parse_tags(tags)
 
+        Normally a single atomic JSON1 UPDATE; the paper is only read when
+        that changes nothing (missing paper or tag already present).
+        """
         tag = tag.strip()
-        if tag and tag not in tags:
-            tags.append(tag)
-            await self.update_paper(paper_id, tags=tags)
-
-        return tags
+        if tag:
+            row = await execute_returning(_ADD_TAG_SQL, (tag, paper_id, tag))
+            if row is not None:
+                _result_cache.invalidate()
+                return self._parse_tags(row["tags"])
+        return await self._edit_tags(paper_id, tag, add=True)
 
     async def remove_tag(self, paper_id: int, tag: str) -> list[str]:
         """
         Remove a tag from a paper. Returns the updated tag list.
+        Same single-UPDATE fast path as add_tag.
         """
+        tag = tag.strip()
+        row = await execute_returning(_REMOVE_TAG_SQL, (tag, paper_id, tag))
+        if row is not None:
+            _result_cache.invalidate()
+            return self._parse_tags(row["tags"])
+        return await self._edit_tags(paper_id, tag, add=False)
+
+    async def _edit_tags(self, paper_id: int, tag: str, add: bool) -> list[str]:
+        """Read-modify-write tag edit for cases the JSON1 UPDATE skips."""
         paper = await self.get_paper(paper_id)
         if not paper:
             raise ValueError(f"Paper {paper_id} not found")
@@ -430,13 +841,16 @@ class PaperLibrary:
         if isinstance(tags, str):
             tags = self._parse_tags(tags)
 
-        tag = tag.strip()
-        if tag in tags:
+        if add and tag and tag not in tags:
+            tags.append(tag)
+            await self.update_paper(paper_id, tags=tags)
+        elif not add and tag in tags:
             tags.remove(tag)
             await self.update_paper(paper_id, tags=tags)
 
         return tags
 
+    @_cached_read
     async def get_all_tags(self) -> list[dict[str, Any]]:
         """
         Get all unique tags across the library with counts.
@@ -444,16 +858,15 @@ class PaperLibrary:
         Returns:
             List of {"tag": str, "count": int} sorted by count descending.
         """
-        rows = await fetch_all("SELECT tags FROM papers WHERE tags IS NOT NULL AND tags != ''")
-        tag_counts: dict[str, int] = {}
-        for row in rows:
-            tags = self._parse_tags(row.get("tags"))
-            for t in tags:
-                tag_counts[t] = tag_counts.get(t, 0) + 1
-
-        result = [{"tag": t, "count": c} for t, c in tag_counts.items()]
-        result.sort(key=lambda x: x["count"], reverse=True)
-        return result
+        rows = await fetch_all_ro(
+            """
+            SELECT tag, COUNT(*) AS cnt
+            FROM paper_tags
+            GROUP BY tag
+            ORDER BY cnt DESC, tag
+            """
+        )
+        return [{"tag": row["tag"], "count": row["cnt"]} for row in rows]
 
     # ------------------------------------------------------------------
     # Notes Management
@@ -480,13 +893,16 @@ class PaperLibrary:
             Dict with total_cost_usd, total_tokens_in, total_tokens_out,
             by_phase breakdown.
         """
-        rows = await fetch_all(
+        rows = await fetch_all_ro(
             """
-            SELECT phase, model_used, tokens_in, tokens_out, cost_usd
-            FROM analysis_results
-            WHERE paper_id = ?
+            SELECT 'phase' AS kind, phase AS grp, SUM(cost_usd) AS cost,
+                   SUM(tokens_in) AS tokens_in, SUM(tokens_out) AS tokens_out
+            FROM analysis_results WHERE paper_id = ? GROUP BY phase
+            UNION ALL
+            SELECT 'model', model_used, SUM(cost_usd), NULL, NULL
+            FROM analysis_results WHERE paper_id = ? GROUP BY model_used
             """,
-            (paper_id,),
+            (paper_id, paper_id),
         )
 
         total_cost = 0.0
@@ -496,17 +912,14 @@ class PaperLibrary:
         by_model: dict[str, float] = {}
 
         for row in rows:
-            cost = row.get("cost_usd", 0.0) or 0.0
-            t_in = row.get("tokens_in", 0) or 0
-            t_out = row.get("tokens_out", 0) or 0
-            phase = row.get("phase", "unknown")
-            model = row.get("model_used", "unknown")
-
-            total_cost += cost
-            total_in += t_in
-            total_out += t_out
-            by_phase[phase] = by_phase.get(phase, 0.0) + cost
-            by_model[model] = by_model.get(model, 0.0) + cost
+            cost = row["cost"] or 0.0
+            if row["kind"] == "phase":
+                total_cost += cost
+                total_in += row["tokens_in"] or 0
+                total_out += row["tokens_out"] or 0
+                by_phase[row["grp"]] = cost
+            else:
+                by_model[row["grp"]] = cost
 
         return {
             "paper_id": paper_id,
@@ -534,56 +947,33 @@ class PaperLibrary:
         year = year or now.year
         month = month or now.month
 
-        month_str = f"{year}-{month:02d}"
-        start = f"{month_str}-01"
-        # Compute end of month
-        if month == 12:
-            end = f"{year + 1}-01-01"
-        else:
-            end = f"{year}-{month + 1:02d}-01"
+        # ISO strings compare correctly against created_at and its index
+        month_str, start, end = _month_bounds(year, month)
 
-        rows = await fetch_all(
-            """
-            SELECT ar.phase, ar.model_used, ar.tokens_in, ar.tokens_out,
-                   ar.cost_usd, ar.created_at
-            FROM analysis_results ar
-            WHERE ar.created_at >= ? AND ar.created_at < ?
-            """,
-            (start, end),
-        )
+        rows = await fetch_all_ro(_MONTHLY_COST_SQL, (start, end) * 3)
 
         total_cost = 0.0
         total_in = 0
         total_out = 0
         by_model: dict[str, float] = {}
         by_phase: dict[str, float] = {}
-        daily: dict[str, dict[str, float]] = {}
-
-        for row in rows:
-            cost = row.get("cost_usd", 0.0) or 0.0
-            t_in = row.get("tokens_in", 0) or 0
-            t_out = row.get("tokens_out", 0) or 0
-            model = row.get("model_used", "unknown") or "unknown"
-            phase = row.get("phase", "unknown") or "unknown"
-            created = row.get("created_at", "")
-
-            total_cost += cost
-            total_in += t_in
-            total_out += t_out
-            by_model[model] = by_model.get(model, 0.0) + cost
-            by_phase[phase] = by_phase.get(phase, 0.0) + cost
-
-            # Daily breakdown
-            day_str = created[:10] if created else "unknown"
-            if day_str not in daily:
-                daily[day_str] = {"cost_usd": 0.0, "count": 0}
-            daily[day_str]["cost_usd"] += cost
-            daily[day_str]["count"] += 1
-
-        daily_breakdown = [
-            {"date": d, "cost_usd": round(v["cost_usd"], 6), "analysis_count": v["count"]}
-            for d, v in sorted(daily.items())
-        ]
+        daily_breakdown: list[dict[str, Any]] = []
+
+        # Rows arrive as (kind, grp, cost, tokens_in, tokens_out, cnt),
+        # already ordered by kind then group, so days come out sorted
+        for kind, grp, cost, tokens_in, tokens_out, cnt in map(dict.values, rows):
+            cost = cost or 0.0
+            if kind == "model":
+                total_cost += cost
+                total_in += tokens_in or 0
+                total_out += tokens_out or 0
+                by_model[grp] = cost
+            elif kind == "phase":
+                by_phase[grp] = cost
+            else:
+                daily_breakdown.append(
+                    {"date": grp, "cost_usd": round(cost, 6), "analysis_count": cnt}
+                )
 
         return {
             "month": month_str,
@@ -599,6 +989,7 @@ class PaperLibrary:
     # Library Statistics
     # ------------------------------------------------------------------
 
+    @_cached_read
     async def get_stats(self) -> dict[str, Any]:
         """
         Get overall library statistics.
@@ -606,59 +997,35 @@ class PaperLibrary:
         Returns:
             Dict with total papers, domain/status/agent counts, cost totals.
         """
-        total_row = await fetch_one("SELECT COUNT(*) as cnt FROM papers")
-        total = total_row["cnt"] if total_row else 0
-
-        # By status
-        status_rows = await fetch_all(
-            "SELECT status, COUNT(*) as cnt FROM papers GROUP BY status"
-        )
-        by_status = {row["status"]: row["cnt"] for row in status_rows}
-
-        # By domain
-        domain_rows = await fetch_all(
-            "SELECT domain, COUNT(*) as cnt FROM papers GROUP BY domain"
-        )
-        by_domain = {row["domain"]: row["cnt"] for row in domain_rows}
-
-        # By agent
-        agent_rows = await fetch_all(
-            "SELECT agent_used, COUNT(*) as cnt FROM papers GROUP BY agent_used"
-        )
-        by_agent = {row["agent_used"]: row["cnt"] for row in agent_rows}
+        # All aggregates in one round trip, as (kind, key, v1, v2, v3) rows
+        rows = await fetch_all_ro(_STATS_SQL)
 
-        # By year
-        year_rows = await fetch_all(
-            "SELECT year, COUNT(*) as cnt FROM papers WHERE year IS NOT NULL GROUP BY year ORDER BY year DESC"
-        )
-        by_year = {row["year"]: row["cnt"] for row in year_rows}
-
-        # Total cost
-        cost_row = await fetch_one(
-            "SELECT SUM(cost_usd) as total_cost, SUM(tokens_in) as total_in, "
-            "SUM(tokens_out) as total_out FROM analysis_results"
-        )
-        total_cost = cost_row["total_cost"] if cost_row and cost_row["total_cost"] else 0.0
-        total_tokens_in = cost_row["total_in"] if cost_row and cost_row["total_in"] else 0
-        total_tokens_out = cost_row["total_out"] if cost_row and cost_row["total_out"] else 0
-
-        # Total analyses
-        analysis_count_row = await fetch_one(
-            "SELECT COUNT(*) as cnt FROM analysis_results"
-        )
-        total_analyses = analysis_count_row["cnt"] if analysis_count_row else 0
-
-        # Total figures
-        figure_count_row = await fetch_one(
-            "SELECT COUNT(*) as cnt FROM figures"
-        )
-        total_figures = figure_count_row["cnt"] if figure_count_row else 0
+        total = total_analyses = total_figures = analyzed_count = 0
+        total_cost = 0.0
+        total_tokens_in = total_tokens_out = 0
+        by_status: dict[Any, int] = {}
+        by_domain: dict[Any, int] = {}
+        by_agent: dict[Any, int] = {}
+        by_year: dict[Any, int] = {}
+        groups = {"status": by_status, "domain": by_domain, "agent": by_agent, "year": by_year}
 
-        # Average cost per paper
-        completed_row = await fetch_one(
-            "SELECT COUNT(DISTINCT paper_id) as cnt FROM analysis_results"
-        )
-        analyzed_count = completed_row["cnt"] if completed_row else 0
+        for row in rows:
+            kind = row["kind"]
+            if kind in groups:
+                groups[kind][row["grp"]] = row["v1"]
+            elif kind == "total":
+                total = row["v1"]
+            elif kind == "cost":
+                total_cost = row["v1"] or 0.0
+                total_tokens_in = row["v2"] or 0
+                total_tokens_out = row["v3"] or 0
+            elif kind == "analyses":
+                total_analyses = row["v1"]
+                analyzed_count = row["v2"]
+            elif kind == "figures":
+                total_figures = row["v1"]
+
+        by_year = dict(sorted(by_year.items(), reverse=True))
         avg_cost = total_cost / analyzed_count if analyzed_count > 0 else 0.0
 
         return {
@@ -682,7 +1049,7 @@ class PaperLibrary:
 
     async def get_analysis_results(self, paper_id: int) -> list[dict]:
         """Get all analysis results for a paper."""
-        rows = await fetch_all(
+        rows = await fetch_all_ro(
             """
             SELECT * FROM analysis_results
             WHERE paper_id = ?
@@ -693,14 +1060,14 @@ class PaperLibrary:
         for row in rows:
             # Parse JSON result
             try:
-                row["parsed_result"] = json.loads(row.get("result", "{}"))
-            except (json.JSONDecodeError, TypeError):
+                row["parsed_result"] = _json_loads(row.get("result", "{}"))
+            except (json.JSONDecodeError, TypeError):  # orjson's error subclasses it
                 row["parsed_result"] = {"raw": row.get("result", "")}
         return rows
 
     async def get_phase_result(self, paper_id: int, phase: str) -> Optional[dict]:
         """Get a specific phase result for a paper."""
-        row = await fetch_one(
+        row = await fetch_one_ro(
             """
             SELECT * FROM analysis_results
             WHERE paper_id = ? AND phase = ?
@@ -710,14 +1077,14 @@ class PaperLibrary:
         )
         if row:
             try:
-                row["parsed_result"] = json.loads(row.get("result", "{}"))
+                row["parsed_result"] = _json_loads(row.get("result", "{}"))
             except (json.JSONDecodeError, TypeError):
                 row["parsed_result"] = {"raw": row.get("result", "")}
         return row
 
     async def get_figures(self, paper_id: int) -> list[dict]:
         """Get all figures for a paper."""
-        return await fetch_all(
+        return await fetch_all_ro(
             "SELECT * FROM figures WHERE paper_id = ? ORDER BY figure_num",
             (paper_id,),
         )
@@ -733,22 +1100,34 @@ class PaperLibrary:
         if isinstance(tags_value, list):
             return tags_value
         if isinstance(tags_value, str):
-            try:
-                parsed = json.loads(tags_value)
-                if isinstance(parsed, list):
-                    return parsed
-            except (json.JSONDecodeError, TypeError):
-                pass
-            # Might be comma-separated
-            if "," in tags_value:
-                return [t.strip() for t in tags_value.split(",") if t.strip()]
-            return [tags_value] if tags_value.strip() else []
+            return list(_parse_tags_str(tags_value))
         return []
 
-    def _sanitize_fts_query(self, query: str) -> str:
+    async def _pop_total(
+        self, rows: list[dict], offset: int, count_query: str, params: tuple
+    ) -> int:
+        """
+        Strip the ``_total`` window column from page rows and return it.
+        Only a page past the end (no rows, offset > 0) needs a separate
+        COUNT query to report the total.
+        """
+        if rows:
+            total = rows[0]["_total"]
+            for row in rows:
+                del row["_total"]
+            return total
+        if offset == 0:
+            return 0
+        count_row = await fetch_one_ro(count_query, params)
+        return count_row["cnt"] if count_row else 0
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _sanitize_fts_query(query: str) -> str:
         """
         Sanitize a user query for FTS5 MATCH syntax.
         Wraps each token in double quotes to prevent syntax errors.
+        Results are memoized since paging repeats the same query.
         """
         # Remove FTS5 special characters that could cause parse errors
         # but preserve user intent
@@ -757,8 +1136,7 @@ class PaperLibrary:
             return '""'
 
         # If query already uses FTS5 operators, pass through
-        fts_operators = {" AND ", " OR ", " NOT ", " NEAR/"}
-        if any(op in query.upper() for op in fts_operators):
+        if _FTS_OPERATOR_RE.search(query):
             return query
 
         # Otherwise, wrap each word in quotes for safety
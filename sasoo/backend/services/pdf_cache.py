@@ -3,42 +3,182 @@ Sasoo - PDF Text Cache
 File-based caching for extracted PDF text to avoid repeated fitz.open() calls.
 
 Cache files are stored alongside the PDF:
-  ~/sasoo-library/papers/{folder_name}/.text_cache.txt
+  ~/sasoo-library/papers/{folder_name}/.text_cache.txt.zst
   ~/sasoo-library/papers/{folder_name}/.text_cache.meta.json
 
-Invalidation: SHA-256 hash of the PDF file. If the PDF changes, the cache
-is automatically regenerated.
+The text is zstd-compressed when the zstandard package is installed, and
+stored as plain UTF-8 in .text_cache.txt otherwise.
+
+Invalidation: the PDF's mtime and size, falling back to a BLAKE3 hash of
+the file (SHA-256 when the blake3 package is not installed) when only the
+mtime differs. If the PDF changes, the cache is automatically regenerated.
 """
 
+import asyncio
+import contextlib
+import functools
 import hashlib
 import json
 import logging
+import mmap
+import multiprocessing
+import os
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+from typing import Iterable, Iterator
 
 import fitz  # PyMuPDF
 
+try:
+    import zstandard as zstd
+except ImportError:  # zstandard is optional; the cache is then plain UTF-8
+    zstd = None
+
+try:
+    import fcntl
+
+    msvcrt = None
+except ImportError:  # Windows
+    import msvcrt
+
 logger = logging.getLogger(__name__)
 
+# Documents with at least this many pages are extracted across processes
+PARALLEL_MIN_PAGES = 16
+EXTRACT_WORKERS = min(4, os.cpu_count() or 1)
+
+_process_pool: ProcessPoolExecutor | None = None
+_process_pool_lock = threading.Lock()
+
+# Papers read and extracted at once by warm_library
+WARM_CONCURRENCY = 8
+
 CACHE_FILENAME = ".text_cache.txt"
+CACHE_ZST_FILENAME = ".text_cache.txt.zst"
+ZSTD_LEVEL = 3
 CACHE_META_FILENAME = ".text_cache.meta.json"
+CACHE_LOCK_FILENAME = ".text_cache.lock"
+
+HASH_CHUNK_SIZE = 1024 * 1024  # 1 MB reads amortize per-chunk Python overhead
+
+
+def _sha256_ctor():
+    """
+    Pick the SHA-256 constructor once. hashlib.new() with
+    usedforsecurity=False goes straight to OpenSSL's EVP digest, which
+    selects SHA-NI / ARMv8 SHA instructions at runtime when the CPU has them.
+    """
+    try:
+        hashlib.new("sha256", usedforsecurity=False)
+    except (TypeError, ValueError):  # Python < 3.9 or restricted builds
+        return hashlib.sha256
+    return functools.partial(hashlib.new, "sha256", usedforsecurity=False)
+
+
+_HASH_CTOR = _sha256_ctor()
+
+# BLAKE3 (optional) is several times faster than SHA-256 and multithreads
+# across large files; the fingerprint only needs collision resistance.
+try:
+    from blake3 import blake3 as _blake3
+
+    HASH_ALGO = "blake3"
+except ImportError:
+    _blake3 = None
+    HASH_ALGO = "sha256"
 
 
 def _pdf_hash(pdf_path: Path) -> str:
-    """Return first 16 hex chars of the PDF's SHA-256."""
-    h = hashlib.sha256()
+    """Return a 16-hex-char fingerprint of the PDF (see HASH_ALGO)."""
+    if _blake3 is not None:
+        h = _blake3(max_threads=_blake3.AUTO)
+        h.update_mmap(pdf_path)
+        return h.hexdigest(length=8)
+
+    h = _HASH_CTOR()
     with open(pdf_path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):  # empty file or unmappable handle
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                h.update(chunk)
+        else:
+            with mm:
+                if hasattr(mm, "madvise"):  # Unix, Python 3.8+
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                h.update(mm)  # hashlib releases the GIL for large buffers
     return h.hexdigest()[:16]
 
 
+def _hash_bytes(data: bytes) -> str:
+    """
+    _pdf_hash for PDF contents already in memory. Both backends release
+    the GIL while hashing, so warm_library's threads hash PDFs in parallel.
+    """
+    if _blake3 is not None:
+        return _blake3(data, max_threads=_blake3.AUTO).hexdigest(length=8)
+    h = _HASH_CTOR()
+    h.update(data)
+    return h.hexdigest()[:16]
+
+
+@functools.lru_cache(maxsize=1024)
+def _pdf_hash_cached(path_str: str, mtime_ns: int, size: int) -> str:
+    """_pdf_hash memoized on the file's identity; a rewrite changes the key."""
+    return _pdf_hash(Path(path_str))
+
+
+def _current_hash(pdf_path: Path) -> str:
+    """Fingerprint of the PDF, rehashed only when its mtime or size changes."""
+    st = pdf_path.stat()
+    return _pdf_hash_cached(str(pdf_path), st.st_mtime_ns, st.st_size)
+
+
 def _read_cache(paper_dir: Path, pdf_path: Path) -> str | None:
     """Return cached text if valid, else None."""
-    cache_file = paper_dir / CACHE_FILENAME
+    cache_file = _valid_cache_file(paper_dir, pdf_path)
+    if cache_file is None:
+        return None
+
+    if cache_file.name == CACHE_ZST_FILENAME:
+        return zstd.ZstdDecompressor().decompress(cache_file.read_bytes()).decode("utf-8")
+
+    data = cache_file.read_bytes()
+    if zstd is not None:
+        # Uncompressed cache from before zstandard was available: convert
+        try:
+            _atomic_write(
+                paper_dir / CACHE_ZST_FILENAME,
+                zstd.ZstdCompressor(level=ZSTD_LEVEL).compress(data),
+            )
+            cache_file.unlink(missing_ok=True)
+        except OSError as exc:
+            logger.debug("Could not compress text cache for %s: %s", paper_dir.name, exc)
+    return data.decode("utf-8")
+
+
+def _valid_cache_file(paper_dir: Path, pdf_path: Path) -> Path | None:
+    """
+    Return the text cache file if it is valid for *pdf_path*, else None.
+
+    A matching (mtime_ns, size) is trusted without reading the PDF. A size
+    change always invalidates; an mtime-only change (e.g. a copy or sync
+    that did not preserve timestamps) falls back to comparing hashes.
+    """
+    plain_file = paper_dir / CACHE_FILENAME
+    zst_file = paper_dir / CACHE_ZST_FILENAME
     meta_file = paper_dir / CACHE_META_FILENAME
 
-    if not cache_file.exists() or not meta_file.exists():
+    if zstd is not None and zst_file.exists():
+        cache_file = zst_file
+    elif plain_file.exists():
+        cache_file = plain_file
+    else:
+        return None
+    if not meta_file.exists():
         return None
 
     try:
@@ -46,36 +186,178 @@ def _read_cache(paper_dir: Path, pdf_path: Path) -> str | None:
     except (json.JSONDecodeError, OSError):
         return None
 
-    if meta.get("pdf_hash") != _pdf_hash(pdf_path):
+    st = pdf_path.stat()
+    if meta.get("size") is not None and meta["size"] != st.st_size:
         return None  # PDF changed → invalidate
+    if meta.get("mtime_ns") != st.st_mtime_ns:
+        # Caches written before hash_algo existed used SHA-256
+        if meta.get("hash_algo", "sha256") != HASH_ALGO:
+            return None  # Fingerprint not comparable → regenerate
+        if meta.get("pdf_hash") != _current_hash(pdf_path):
+            return None  # PDF changed → invalidate
 
-    return cache_file.read_text(encoding="utf-8")
+    return cache_file
 
 
-def _write_cache(paper_dir: Path, pdf_path: Path, text: str) -> None:
-    """Persist extracted text to disk."""
-    cache_file = paper_dir / CACHE_FILENAME
+def _write_cache(
+    paper_dir: Path, pdf_path: Path, text: str, pdf_hash: str | None = None
+) -> None:
+    """Persist extracted text to disk. Pass *pdf_hash* if already known."""
     meta_file = paper_dir / CACHE_META_FILENAME
+    data = text.encode("utf-8")
+    if zstd is not None:
+        cache_file = paper_dir / CACHE_ZST_FILENAME
+        stale_file = paper_dir / CACHE_FILENAME
+        data = zstd.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    else:
+        cache_file = paper_dir / CACHE_FILENAME
+        stale_file = paper_dir / CACHE_ZST_FILENAME
 
-    cache_file.write_text(text, encoding="utf-8")
-    meta_file.write_text(
+    st = pdf_path.stat()
+    # Text before meta, each via rename, so a meta file never describes a
+    # partially written or older text file
+    _atomic_write(cache_file, data)
+    stale_file.unlink(missing_ok=True)
+    _atomic_write(
+        meta_file,
         json.dumps({
-            "pdf_hash": _pdf_hash(pdf_path),
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "pdf_hash": pdf_hash or _current_hash(pdf_path),
+            "hash_algo": HASH_ALGO,
             "extracted_at": time.time(),
             "char_count": len(text),
-        }),
-        encoding="utf-8",
+        }).encode("utf-8"),
     )
 
 
-def _extract_full_text(pdf_path: Path) -> str:
+def _atomic_write(path: Path, content: bytes) -> None:
+    """Write *content* to a temp file beside *path*, then rename over it."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp.write_bytes(content)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+@contextlib.contextmanager
+def _extraction_lock(paper_dir: Path) -> Iterator[None]:
+    """
+    Exclusive lock held while a paper's text is extracted, so concurrent
+    warmers (threads or processes) don't extract the same PDF twice.
+    """
+    with open(paper_dir / CACHE_LOCK_FILENAME, "a+b") as lock_file:
+        if msvcrt is not None:
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK gives up after ~10 s; keep waiting
+                    continue
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _extract_and_cache(
+    paper_dir: Path, pdf_path: Path, data: bytes | None = None
+) -> tuple[str, bool]:
+    """
+    Extract and cache the PDF text under the extraction lock. Pass the
+    PDF's *data* if it has already been read.
+
+    Returns (text, extracted); *extracted* is False when a concurrent
+    caller populated the cache while we waited for the lock.
+    """
+    with _extraction_lock(paper_dir):
+        cached = _read_cache(paper_dir, pdf_path)
+        if cached is not None:
+            return cached, False
+        # One read of the PDF feeds both the parser and the fingerprint
+        if data is None:
+            data = pdf_path.read_bytes()
+        text = _extract_full_text(pdf_path, data)
+        _write_cache(paper_dir, pdf_path, text, _hash_bytes(data))
+        return text, True
+
+
+def _extract_pages(pdf_path: str, start: int, stop: int) -> list[str]:
+    """Process-pool worker: text of pages [start, stop)."""
+    doc = fitz.open(pdf_path)
+    try:
+        return [doc[i].get_text() for i in range(start, stop)]
+    finally:
+        doc.close()
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Lazily create the shared text-extraction process pool."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=EXTRACT_WORKERS)
+        return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    """Stop the text-extraction worker processes, if they were started."""
+    global _process_pool
+    with _process_pool_lock:
+        pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def extract_page_texts(pdf_path: Path, data: bytes | None = None) -> list[str]:
+    """
+    Return the plain text of every page, in page order.
+
+    MuPDF text extraction holds the GIL for much of its work, so long
+    documents are split into contiguous page blocks and extracted in
+    worker processes. Short documents stay in-process, where pool
+    round-trips would cost more than they save. Pass the file's *data*
+    if it has already been read to parse it from memory.
+    """
+    if data is not None:
+        doc = fitz.open(stream=data, filetype="pdf")
+    else:
+        doc = fitz.open(str(pdf_path))
+    try:
+        page_count = len(doc)
+        # Already in a worker process (e.g. PdfParser's pool): no nested pool
+        if (page_count < PARALLEL_MIN_PAGES or EXTRACT_WORKERS < 2
+                or multiprocessing.parent_process() is not None):
+            return [page.get_text() for page in doc]
+    finally:
+        doc.close()
+
+    block = -(-page_count // EXTRACT_WORKERS)  # ceil division
+    try:
+        pool = _get_process_pool()
+        futures = [
+            pool.submit(_extract_pages, str(pdf_path), start, min(start + block, page_count))
+            for start in range(0, page_count, block)
+        ]
+        return [text for future in futures for text in future.result()]
+    except (BrokenProcessPool, OSError) as exc:
+        logger.warning("Parallel text extraction failed, retrying in-process: %s", exc)
+        return _extract_pages(str(pdf_path), 0, page_count)
+
+
+def _extract_full_text(pdf_path: Path, data: bytes | None = None) -> str:
     """Extract full text from every page of the PDF."""
-    doc = fitz.open(str(pdf_path))
-    parts: list[str] = []
-    for page in doc:
-        parts.append(page.get_text())
-    doc.close()
-    return "\n".join(parts)
+    return "\n".join(extract_page_texts(pdf_path, data))
 
 
 def get_pdf_text(paper_dir: Path) -> str:
@@ -102,8 +384,7 @@ def get_pdf_text(paper_dir: Path) -> str:
 
     # Cache miss → extract and save
     logger.info("PDF text cache MISS for %s — extracting...", paper_dir.name)
-    text = _extract_full_text(pdf_path)
-    _write_cache(paper_dir, pdf_path, text)
+    text, _ = _extract_and_cache(paper_dir, pdf_path)
     return text
 
 
@@ -118,6 +399,49 @@ def warm_cache(paper_dir: Path) -> None:
 
     pdf_path = pdf_files[0]
     if _read_cache(paper_dir, pdf_path) is None:
-        text = _extract_full_text(pdf_path)
-        _write_cache(paper_dir, pdf_path, text)
-        logger.info("Warmed PDF text cache for %s (%d chars)", paper_dir.name, len(text))
+        text, extracted = _extract_and_cache(paper_dir, pdf_path)
+        if extracted:
+            logger.info("Warmed PDF text cache for %s (%d chars)", paper_dir.name, len(text))
+
+
+async def warm_library(
+    paper_dirs: Iterable[Path], concurrency: int = WARM_CONCURRENCY
+) -> int:
+    """
+    Warm the text cache for many paper directories concurrently.
+
+    Up to *concurrency* papers are in flight at once: their PDFs are read
+    off the event loop in parallel (overlapping I/O latency) and extracted
+    from memory. Papers whose cache is already valid cost a few stat calls.
+    Failures are logged and skipped.
+
+    Returns the number of papers that were (re)extracted.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def warm_one(paper_dir: Path) -> bool:
+        async with semaphore:
+            pdf_files = await asyncio.to_thread(lambda: list(paper_dir.glob("*.pdf")))
+            if not pdf_files:
+                return False
+            pdf_path = pdf_files[0]
+            if await asyncio.to_thread(_valid_cache_file, paper_dir, pdf_path):
+                return False
+            data = await asyncio.to_thread(pdf_path.read_bytes)
+            _, extracted = await asyncio.to_thread(
+                _extract_and_cache, paper_dir, pdf_path, data
+            )
+            return extracted
+
+    paper_dirs = list(paper_dirs)
+    results = await asyncio.gather(
+        *(warm_one(d) for d in paper_dirs), return_exceptions=True
+    )
+    warmed = 0
+    for paper_dir, result in zip(paper_dirs, results):
+        if isinstance(result, Exception):
+            logger.warning("Failed to warm PDF text cache for %s: %s", paper_dir.name, result)
+        elif result:
+            warmed += 1
+    logger.info("Warmed PDF text cache for %d of %d papers", warmed, len(paper_dirs))
+    return warmed
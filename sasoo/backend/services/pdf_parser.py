@@ -1,23 +1,325 @@
 """
 PDF Parser for extracting text, figures, tables, and metadata from research papers.
 
-This service uses PyMuPDF (fitz) for text and image extraction, and pdfplumber
-for table extraction. It implements intelligent caption matching and creates
-structured output directories.
+This service uses PyMuPDF (fitz) for text, image and table extraction. It
+implements intelligent caption matching and creates structured output
+directories.
 """
+import bisect
+import functools
+import io
+import itertools
+import operator
 import re
+import sys
+import weakref
 import fitz  # PyMuPDF
-import pdfplumber
 from pathlib import Path
 from typing import Optional
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
-from PIL import Image
-import io
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
 from models.paper import ParsedPaper, Figure, Table, Metadata, StructuredCaption, SubCaption, FigureReference
 
 
+# Contiguous pages rendered per worker task, so each process opens the
+# PDF once for several pages
+FIGURE_PAGE_BLOCK = 4
+
+
+# Figure and table caption (head, end anchor) patterns. Captions run from
+# the head to the next end anchor of their own kind (a figure caption may
+# mention "Tbl.", a table caption "Fig."); the anchors are found in one pass
+# up front instead of a lazy (.+?) retrying a lookahead at every character
+# of the body
+_FIGURE_CAPTION_RES = (
+    re.compile(r"(Figure|Fig\.?)\s+(\d+[a-zA-Z]?)[:\.\s]+", re.IGNORECASE),
+    re.compile(r"(?=\n\n|Figure|Fig\.|Table|\n[A-Z][a-z]+\s+\d+)", re.IGNORECASE),
+)
+_TABLE_CAPTION_RES = (
+    re.compile(r"(Table|Tbl\.?)\s+(\d+[a-zA-Z]?)[:\.\s]+", re.IGNORECASE),
+    re.compile(r"(?=\n\n|Table|Tbl\.|Figure|\n[A-Z][a-z]+\s+\d+)", re.IGNORECASE),
+)
+
+# PdfParser.AUTHOR_PATTERNS[0], with name parts kept on one line
+_AUTHOR_RE = re.compile(r"([A-Z][a-z]+(?:[^\S\n]+[A-Z]\.?)?[^\S\n]+[A-Z][a-z]+)")
+_AUTHOR_STOP_RE = re.compile(r"\babstract\b|\bintroduction\b", re.IGNORECASE)
+
+# Lines that can't be a title: page numbers, "Page N", all-caps headers
+_TITLE_SKIP_RE = re.compile(r"\d+$|(?i:Page \d+)|[A-Z\s]+$")
+
+# PdfParser.DOI_PATTERN / YEAR_PATTERN, compiled. The year group is
+# non-capturing so findall() yields whole years, not just "19"/"20".
+# The optional "doi:" prefix and leading \s* are dropped from the DOI
+# pattern: they never change group 1, and \s* retried at every offset of a
+# long whitespace run made search() quadratic on layout-padded pages.
+_DOI_RE = re.compile(r"(10\.\d{4,}/[^\s]+)")
+_YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+
+# Output directory name cleanup
+_DIR_UNSAFE_RE = re.compile(r"[^\w\s-]")
+_DIR_SEPARATOR_RE = re.compile(r"[-\s]+")
+
+# Strict caption pattern - must be start of block or have separator
+# Matches: "Figure 1 |", "Figure 1.", "Figure 1:", "Fig. 2 -"
+# Avoids: "see Figure 1 for", "in Figure 1, we"
+_FIGURE_CAPTION_START_RE = re.compile(
+    r"^(Figure|Fig\.?)\s+(\d+[a-zA-Z]?)\s*[\|\.\:\-]",
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Sub-figure labels: (A), (a), a), A., a.
+_SUB_LABEL_RE = re.compile(
+    r'[\(\|]\s*([A-Za-z])\s*[\)\.\,\|]|'  # (A) or |A| or A) or A.
+    r'\b([a-z])\s*[,;]\s+(?=[A-Z])',       # a, Description
+    re.IGNORECASE
+)
+
+# In-text figure references; the sentence around each is the context
+# Matches: Fig. 1, Figure 1A, Fig. 1a, Figs. 1-3, Figure 1 (A), etc.
+_FIGURE_REF_RE = re.compile(
+    r'Fig(?:ure|s)?\.?\s*'  # Figure/Fig./Figs.
+    r'(\d+)\s*'  # Figure number
+    r'([A-Za-z](?![A-Za-z]))?'  # Optional sub-label (not a following word)
+    r'(?:\s*[-–]\s*\d+[A-Za-z]?)?'  # Optional range
+    r'(?:\s*\([A-Za-z]\))?',  # Optional (A) format
+    re.IGNORECASE
+)
+# Whitespace after a period ends a sentence, except after "Fig." / "Figs."
+_SENTENCE_BREAK_RE = re.compile(r'(?<=\.)(?<!\bFig\.)(?<!\bFigs\.)\s+', re.IGNORECASE)
+_PAGE_MARKER_RE = re.compile(r'--- Page \d+ ---')
+
+# Any mention of a numbered table ("Table 2", "TABLE IV", "Tbl. 1"); pages
+# without one are not searched for tables
+_TABLE_MENTION_RE = re.compile(r"\b(?i:Table|Tbl\.)\s+(?:\d|[IVX]+\b)")
+# Page markers (group 1) and table mentions in one alternation, so a single
+# pass over the full text finds both
+_TABLE_PAGE_SCAN_RE = re.compile(
+    f"({_PAGE_MARKER_RE.pattern})|{_TABLE_MENTION_RE.pattern}"
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _scan_captions(full_text: str) -> tuple[dict[str, str], dict[str, str]]:
+    """
+    Collect caption text by number from the paper text.
+
+    Returns (figure_captions, table_captions). Cached so the figure and
+    table matchers share the scans; callers must not mutate the dicts.
+    """
+    return (
+        _scan_caption_kind(full_text, *_FIGURE_CAPTION_RES),
+        _scan_caption_kind(full_text, *_TABLE_CAPTION_RES),
+    )
+
+
+def _scan_caption_kind(
+    full_text: str, head_re: re.Pattern, end_re: re.Pattern
+) -> dict[str, str]:
+    """Captions by number for one caption kind (see _scan_captions)."""
+    captions: dict[str, str] = {}
+
+    text_len = len(full_text)
+    ends = [m.start() for m in end_re.finditer(full_text)]
+    # End of text, or just before a trailing newline
+    if full_text.endswith("\n"):
+        ends.append(text_len - 1)
+    ends.append(text_len)
+
+    pos = 0
+    while match := head_re.search(full_text, pos):
+        start = match.end()
+        if start == text_len:
+            # The caption needs at least one character; take it from the
+            # separator run if that leaves one behind
+            if start - match.end(2) < 2:
+                pos = match.start() + 1
+                continue
+            start -= 1
+        # First anchor after the caption's first character
+        pos = ends[bisect.bisect_right(ends, start)]
+
+        # Clean up caption (remove excessive whitespace)
+        captions[match.group(2)] = " ".join(full_text[start:pos].split())
+    return captions
+
+
+def _split_caption(
+    text: str, markers: list[tuple[int, int, str]]
+) -> tuple[str, tuple[tuple[str, str], ...]]:
+    """
+    Split a caption at its sub-caption markers into (title, ((label, text), ...)).
+
+    markers are (start, end, label) for each _SUB_LABEL_RE match in text,
+    with labels already uppercased.
+    """
+    if not markers:
+        # No sub-captions found, entire text is the title
+        return text, ()
+
+    # Title is everything before the first sub-caption marker
+    title = text[:markers[0][0]].strip()
+
+    # Remove trailing punctuation (and the spaces around it) from title
+    title = title.rstrip('.:|- \t\n')
+
+    # Extract sub-captions; each runs up to the next marker's start, the
+    # last one to the end of the text
+    sub_captions = []
+    sub_captions_append = sub_captions.append
+    ends = [marker[0] for marker in markers[1:]]
+    ends.append(len(text))
+    for (_, start, label), end in zip(markers, ends):
+        # Clean up trailing punctuation before next label
+        sub_text = text[start:end].strip().rstrip('.;,| \t\n')
+
+        if sub_text:
+            sub_captions_append((label, sub_text))
+
+    return title, tuple(sub_captions)
+
+
+def _caption_marker(match: re.Match, offset: int = 0) -> tuple[int, int, str]:
+    """(start, end, label) of a _SUB_LABEL_RE match, relative to offset."""
+    label = match.group(1) or match.group(2)
+    return match.start() - offset, match.end() - offset, label.upper()
+
+
+@functools.lru_cache(maxsize=2048)
+def _parse_caption_cached(text: str) -> tuple[str, tuple[tuple[str, str], ...]]:
+    """
+    Split a whitespace-normalized caption into (title, ((label, text), ...)).
+
+    Cached because panels often repeat the same caption; results are plain
+    tuples so no cached value can be mutated by a caller.
+    """
+    # Every sub-label form needs "(", "|", "," or ";"; captions without
+    # any of them are all title, no regex scan needed
+    if (text.find("(") < 0 and text.find("|") < 0
+            and text.find(",") < 0 and text.find(";") < 0):
+        return text, ()
+
+    return _split_caption(
+        text, [_caption_marker(m) for m in _SUB_LABEL_RE.finditer(text)]
+    )
+
+
+def _parse_captions_batch(
+    texts: list[str]
+) -> list[tuple[str, tuple[tuple[str, str], ...]]]:
+    """
+    _parse_caption_cached for many captions with a single regex scan.
+
+    Captions are joined with NUL, which no part of _SUB_LABEL_RE can match,
+    so matches never cross captions; offsets map them back.
+    """
+    joined = "\0".join(texts)
+    starts = []
+    offset = 0
+    for text in texts:
+        starts.append(offset)
+        offset += len(text) + 1
+
+    markers: list[list[tuple[int, int, str]]] = [[] for _ in texts]
+    for match in _SUB_LABEL_RE.finditer(joined):
+        idx = bisect.bisect_right(starts, match.start()) - 1
+        markers[idx].append(_caption_marker(match, starts[idx]))
+
+    return [_split_caption(text, m) for text, m in zip(texts, markers)]
+
+
+def _to_structured_caption(
+    parsed: tuple[str, tuple[tuple[str, str], ...]]
+) -> StructuredCaption:
+    """Build a fresh StructuredCaption from a parsed caption tuple."""
+    title, sub_captions = parsed
+    return StructuredCaption(
+        title=title,
+        sub_captions=[SubCaption(label=label, text=sub_text)
+                      for label, sub_text in sub_captions]
+    )
+
+
+def _render_page_block(
+    pdf_path: Path, regions: list[dict], figures_dir: Path
+) -> list[Figure]:
+    """
+    Render and save the figure regions of one block of pages.
+
+    Module-level so it can run in a worker process; the document is opened
+    once per block here because fitz documents can't be pickled.
+    """
+    doc = fitz.open(pdf_path)
+    try:
+        return _render_regions(doc, regions, figures_dir)
+    finally:
+        doc.close()
+
+
+def _render_regions(
+    doc: fitz.Document, regions: list[dict], figures_dir: Path
+) -> list[Figure]:
+    """Render the figure regions (in page order) of an open document."""
+    figures = []
+    # Render at high resolution (2x for clarity)
+    zoom = 2.0
+    mat = fitz.Matrix(zoom, zoom)
+
+    # Regions arrive in page order, so groupby yields each page once
+    for page_num, page_group in itertools.groupby(
+        regions, key=operator.itemgetter("page_num")
+    ):
+        page_regions = list(page_group)
+        try:
+            page = doc[page_num]
+            # A page with several figures is interpreted once into a
+            # display list; each figure is then clip-rendered so only its
+            # area is drawn
+            renderer = page.get_displaylist() if len(page_regions) > 1 else page
+        except Exception:
+            continue
+
+        for region in page_regions:
+            try:
+                bbox = region["bbox"]
+                pix = renderer.get_pixmap(
+                    matrix=mat, clip=fitz.Rect(*bbox), alpha=False
+                )
+
+                # Skip if too small after cropping. Pixmaps are dropped as
+                # soon as they're done with, so the next render doesn't
+                # allocate while the previous buffer is still alive
+                if pix.width < 100 or pix.height < 100:
+                    pix = None
+                    continue
+
+                # Save figure straight from the pixmap buffer
+                figure_id = f"figure_{region['fig_num']}"
+                image_filename = f"{figure_id}.png"
+                image_path = figures_dir / image_filename
+                pix.save(str(image_path))
+                pix = None
+
+                figures.append(Figure(
+                    figure_id=figure_id,
+                    page_number=page_num + 1,
+                    bbox=bbox,
+                    image_path=image_path,
+                    caption=region.get("caption", "")
+                ))
+
+            except Exception as e:
+                # Skip problematic figures
+                continue
+
+        # Release the page's display list before building the next one
+        renderer = None
+
+    return figures
+
+
 class PdfParserError(Exception):
     """Base exception for PDF parsing errors."""
     pass
@@ -44,6 +346,15 @@ class PdfParser:
     FIGURES_SUBDIR = "figures"
     TABLES_SUBDIR = "tables"
 
+    # Embedded image formats written to disk as-is (gray or RGB only)
+    PASSTHROUGH_IMAGE_EXTS = ("png", "jpeg", "jpg")
+
+    # Above this many captions, sub-labels are found in one joined scan
+    BATCH_CAPTION_MIN = 32
+
+    # Pattern strings kept as class attributes for reference; extraction
+    # runs on the precompiled module-level _..._RE objects above, so no
+    # method compiles a regex per call
     # Caption detection patterns
     CAPTION_PATTERNS = [
         r"(Figure|Fig\.?)\s+(\d+[a-zA-Z]?)[:\.\s]+(.+?)(?=\n\n|\n[A-Z]|$)",
@@ -60,7 +371,7 @@ class PdfParser:
     ]
 
     DOI_PATTERN = r"(?:doi:|DOI:)?\s*(10\.\d{4,}/[^\s]+)"
-    YEAR_PATTERN = r"\b(19|20)\d{2}\b"
+    YEAR_PATTERN = r"\b(?:19|20)\d{2}\b"
 
     def __init__(self, output_base_dir: Path = Path("./papers")):
         """
@@ -71,7 +382,21 @@ class PdfParser:
         """
         self.output_base_dir = Path(output_base_dir)
         self.output_base_dir.mkdir(parents=True, exist_ok=True)
-        self._executor = ThreadPoolExecutor(max_workers=4)
+        # Processes, not threads: MuPDF work mostly holds the GIL, so
+        # concurrent parse() calls only run in parallel across processes
+        self._executor = ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 1))
+        # Shut the pool down when the parser is collected (or at exit)
+        # without a __del__; the callback holds the executor, not self
+        self._finalizer = weakref.finalize(self, self._executor.shutdown, wait=False)
+
+    def __getstate__(self):
+        # Bound methods sent to the executor pickle the parser; the
+        # executor and its finalizer can't cross the process boundary and
+        # aren't needed there
+        state = self.__dict__.copy()
+        state.pop("_executor", None)
+        state.pop("_finalizer", None)
+        return state
 
     async def parse(self, pdf_path: str | Path) -> ParsedPaper:
         """
@@ -89,56 +414,31 @@ class PdfParser:
         """
         pdf_path = Path(pdf_path)
 
-        if not pdf_path.exists():
+        # One stat() serves the existence check, the size limit and the
+        # metadata
+        try:
+            file_size = pdf_path.stat().st_size
+        except FileNotFoundError:
             raise PdfParserError(f"PDF file not found: {pdf_path}")
 
         # Check file size
-        file_size = pdf_path.stat().st_size
         if file_size > self.MAX_FILE_SIZE:
             raise FileSizeExceededError(
                 f"PDF size ({file_size / 1024 / 1024:.1f}MB) exceeds "
                 f"maximum allowed ({self.MAX_FILE_SIZE / 1024 / 1024:.0f}MB)"
             )
 
-        # Run blocking I/O operations in executor
-        loop = asyncio.get_event_loop()
-
-        # Extract metadata first to create proper directory structure
-        metadata = await loop.run_in_executor(
-            self._executor,
-            self._extract_metadata,
-            pdf_path
-        )
-
-        # Create output directory
-        base_path = self._create_output_directory(metadata, pdf_path)
-        figures_dir = base_path / self.FIGURES_SUBDIR
-        figures_dir.mkdir(exist_ok=True)
-
-        # Extract components in parallel
-        text_task = loop.run_in_executor(
-            self._executor,
-            self._extract_text,
-            pdf_path
-        )
-
-        figures_task = loop.run_in_executor(
-            self._executor,
-            self._extract_figures,
-            pdf_path,
-            figures_dir
-        )
-
-        tables_task = loop.run_in_executor(
-            self._executor,
-            self._extract_tables,
-            pdf_path
-        )
-
-        # Wait for all extractions
-        full_text, figures, tables = await asyncio.gather(
-            text_task, figures_task, tables_task
+        # Run blocking I/O operations in executor: one fitz document serves
+        # metadata, text, figure and table extraction
+        loop = asyncio.get_running_loop()
+        (metadata, base_path, figures_dir, full_text,
+         figure_regions, figures, tables) = await loop.run_in_executor(
+            self._executor, self._extract_all, pdf_path, file_size
         )
+        if figure_regions:
+            figures = await self._extract_figures(
+                pdf_path, figure_regions, figures_dir
+            )
 
         # Match captions with figures and tables
         figures = self._match_captions_to_figures(full_text, figures)
@@ -157,14 +457,62 @@ class PdfParser:
             figures_dir=figures_dir
         )
 
-    def _extract_metadata(self, pdf_path: Path) -> Metadata:
+    def _extract_all(
+        self, pdf_path: Path, file_size: int
+    ) -> tuple[Metadata, Path, Path, str, list[dict], list[Figure], list[Table]]:
+        """
+        Open the PDF once and run every extractor against that document.
+
+        Args:
+            pdf_path: Path to the PDF file
+            file_size: Size in bytes, as already stat'ed by parse()
+
+        Returns:
+            (metadata, base_path, figures_dir, full_text, figure_regions,
+            figures, tables); figure_regions holds the regions still to be
+            rendered and is empty when figures are already complete
+        """
+        doc = fitz.open(pdf_path)
+        try:
+            # Metadata first to create proper directory structure
+            metadata = self._extract_metadata(pdf_path, doc, file_size)
+
+            base_path = self._create_output_directory(metadata, pdf_path)
+            figures_dir = base_path / self.FIGURES_SUBDIR
+            figures_dir.mkdir(exist_ok=True)
+
+            # One text pass yields the full text and the figure regions.
+            # Regions spanning several page blocks are rendered in parallel
+            # by parse(); a single block is rendered here on the already
+            # open document. Without captions, fall back to large embedded
+            # images
+            full_text, figure_regions = self._scan_document(doc)
+            if not figure_regions:
+                figures = self._extract_large_images_fallback(doc, figures_dir)
+            elif (figure_regions[-1]["page_num"] // FIGURE_PAGE_BLOCK
+                    == figure_regions[0]["page_num"] // FIGURE_PAGE_BLOCK):
+                figures = _render_regions(doc, figure_regions, figures_dir)
+                figure_regions = []
+            else:
+                figures = []
+            tables = self._extract_tables(doc, self._table_pages(full_text))
+        finally:
+            doc.close()
+
+        return (
+            metadata, base_path, figures_dir, full_text,
+            figure_regions, figures, tables,
+        )
+
+    def _extract_metadata(
+        self, pdf_path: Path, doc: fitz.Document, file_size: int
+    ) -> Metadata:
         """Extract metadata from PDF properties and first page."""
         metadata = Metadata(
             file_name=pdf_path.name,
-            file_size_bytes=pdf_path.stat().st_size
+            file_size_bytes=file_size
         )
 
-        doc = fitz.open(pdf_path)
         metadata.page_count = len(doc)
 
         # PDF metadata
@@ -194,57 +542,69 @@ class PdfParser:
                 metadata.authors = self._extract_authors(first_page_text)
 
             # Extract DOI
-            doi_match = re.search(self.DOI_PATTERN, first_page_text, re.IGNORECASE)
+            doi_match = _DOI_RE.search(first_page_text)
             if doi_match:
                 metadata.doi = doi_match.group(1)
 
-            # Extract year
-            year_matches = re.findall(self.YEAR_PATTERN, first_page_text)
+            # Extract year from the page head, where the journal header and
+            # dates sit, instead of the whole first page
+            year_matches = _YEAR_RE.findall(first_page_text, 0, 4096)
             if year_matches:
-                # Take the most recent year found
-                metadata.year = max(int(y) for y in year_matches)
+                # Take the most recent year found (same-length digit
+                # strings compare like the numbers)
+                metadata.year = int(max(year_matches))
 
-        doc.close()
         return metadata
 
     def _extract_title(self, first_page_text: str) -> str:
         """Extract paper title from first page text."""
-        lines = [l.strip() for l in first_page_text.split('\n') if l.strip()]
+        # Walk lines with str.find and stop after the first 10 non-empty
+        # ones instead of splitting and stripping the whole page
+        first_line = None
+        checked = 0
+        pos = 0
+        text_len = len(first_page_text)
+        while checked < 10 and pos <= text_len:  # Check first 10 lines
+            end = first_page_text.find('\n', pos)
+            if end == -1:
+                end = text_len
+            line = first_page_text[pos:end].strip()
+            pos = end + 1
+            if not line:
+                continue
+            if first_line is None:
+                first_line = line
+            checked += 1
 
-        # Title is usually the first substantial line (not metadata)
-        for line in lines[:10]:  # Check first 10 lines
+            # Title is usually the first substantial line (not metadata)
             # Skip short lines, page numbers, headers
-            if (len(line) > 20 and
-                not re.match(r'^\d+$', line) and
-                not re.match(r'^Page \d+', line, re.IGNORECASE) and
-                not re.match(r'^[A-Z\s]+$', line)):  # Skip all-caps headers
+            if len(line) > 20 and not _TITLE_SKIP_RE.match(line):
                 return line
 
-        return lines[0] if lines else "Unknown Title"
+        return first_line or "Unknown Title"
 
     def _extract_authors(self, first_page_text: str) -> list[str]:
         """Extract author names from first page text."""
-        lines = first_page_text.split('\n')[:20]  # Check first 20 lines
-        authors = []
+        # Check first 20 lines
+        end = -1
+        for _ in range(20):
+            end = first_page_text.find('\n', end + 1)
+            if end == -1:
+                end = len(first_page_text)
+                break
 
-        for line in lines:
-            # Look for lines with name-like patterns
-            matches = re.findall(self.AUTHOR_PATTERNS[0], line)
-            if matches:
-                authors.extend(matches)
+        # Stop at abstract or introduction (that line is still scanned)
+        stop = _AUTHOR_STOP_RE.search(first_page_text, 0, end)
+        if stop:
+            line_end = first_page_text.find('\n', stop.end(), end)
+            end = line_end if line_end != -1 else end
 
-            # Stop at abstract or introduction
-            if re.search(r'\babstract\b|\bintroduction\b', line, re.IGNORECASE):
-                break
+        # One scan for name-like patterns over the whole header region
+        authors = _AUTHOR_RE.findall(first_page_text, 0, end)
 
-        # Deduplicate and limit
-        seen = set()
-        unique_authors = []
-        for author in authors:
-            author_clean = author.strip()
-            if author_clean and author_clean not in seen:
-                seen.add(author_clean)
-                unique_authors.append(author_clean)
+        # Deduplicate (dict keeps first-seen order) and limit; matches
+        # start and end on letters, so they are never blank
+        unique_authors = list(dict.fromkeys(authors))
 
         return unique_authors[:10]  # Limit to 10 authors
 
@@ -269,8 +629,8 @@ class PdfParser:
 
         # Shorten title to ~30 chars, remove special chars
         title = metadata.title[:30] if metadata.title else pdf_path.stem
-        title_clean = re.sub(r'[^\w\s-]', '', title).strip()
-        title_clean = re.sub(r'[-\s]+', '_', title_clean)
+        title_clean = _DIR_UNSAFE_RE.sub('', title).strip()
+        title_clean = _DIR_SEPARATOR_RE.sub('_', title_clean)
 
         dir_name = f"{year}_{first_author}_{title_clean}"
 
@@ -280,100 +640,50 @@ class PdfParser:
 
         return output_dir
 
-    def _extract_text(self, pdf_path: Path) -> str:
-        """Extract full text from PDF with layout preservation."""
-        doc = fitz.open(pdf_path)
-        full_text = []
-
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            text = page.get_text("text")
-            full_text.append(f"\n--- Page {page_num + 1} ---\n")
-            full_text.append(text)
-
-        doc.close()
-        return "".join(full_text)
-
-    def _extract_figures(self, pdf_path: Path, figures_dir: Path) -> list[Figure]:
+    async def _extract_figures(
+        self, pdf_path: Path, figure_regions: list[dict], figures_dir: Path
+    ) -> list[Figure]:
         """
-        Extract figures from PDF by rendering pages and cropping figure regions.
+        Extract figures by rendering the figure regions of each page.
 
-        This approach renders entire pages as images and identifies figure regions
-        based on caption positions, avoiding the fragmentation issue with embedded
-        image extraction.
+        Regions come from caption positions, avoiding the fragmentation issue
+        with embedded image extraction. Blocks of pages are rendered in
+        parallel on the process pool.
 
         Args:
-            pdf_path: Path to PDF
+            pdf_path: Path to the PDF file
+            figure_regions: Regions from _scan_document
             figures_dir: Directory to save figure images
 
         Returns:
             List of Figure objects
         """
-        doc = fitz.open(pdf_path)
-        figures = []
-
-        # First pass: find all figure captions with their positions
-        figure_regions = self._find_figure_regions(doc)
-
-        # Fallback: if no captions found, use large embedded images
-        if not figure_regions:
-            figures = self._extract_large_images_fallback(doc, figures_dir)
-            doc.close()
-            return figures
-
-        # Second pass: render and crop each figure region
+        # One task per block of FIGURE_PAGE_BLOCK pages with figures; each
+        # worker reopens the PDF since fitz documents don't pickle
+        regions_by_block: dict[int, list[dict]] = {}
         for region in figure_regions:
-            try:
-                page = doc[region["page_num"]]
-
-                # Render page at high resolution (2x for clarity)
-                zoom = 2.0
-                mat = fitz.Matrix(zoom, zoom)
-                pix = page.get_pixmap(matrix=mat)
-
-                # Convert to PIL Image
-                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-
-                # Scale bbox coordinates
-                bbox = region["bbox"]
-                scaled_bbox = (
-                    int(bbox[0] * zoom),
-                    int(bbox[1] * zoom),
-                    int(bbox[2] * zoom),
-                    int(bbox[3] * zoom)
-                )
-
-                # Crop the figure region
-                cropped = img.crop(scaled_bbox)
-
-                # Skip if too small after cropping
-                if cropped.width < 100 or cropped.height < 100:
-                    continue
-
-                # Save figure
-                figure_id = f"figure_{region['fig_num']}"
-                image_filename = f"{figure_id}.png"
-                image_path = figures_dir / image_filename
-                cropped.save(image_path, "PNG", optimize=True)
-
-                figures.append(Figure(
-                    figure_id=figure_id,
-                    page_number=region["page_num"] + 1,
-                    bbox=bbox,
-                    image_path=image_path,
-                    caption=region.get("caption", "")
-                ))
+            block = region["page_num"] // FIGURE_PAGE_BLOCK
+            regions_by_block.setdefault(block, []).append(region)
+
+        loop = asyncio.get_running_loop()
+        block_results = await asyncio.gather(*(
+            loop.run_in_executor(
+                self._executor, _render_page_block,
+                pdf_path, block_regions, figures_dir
+            )
+            for block_regions in regions_by_block.values()
+        ))
 
-            except Exception as e:
-                # Skip problematic figures
-                continue
+        # Regions are collected page by page, so this keeps document order
+        return [figure for figures in block_results for figure in figures]
 
-        doc.close()
-        return figures
-
-    def _find_figure_regions(self, doc: fitz.Document) -> list[dict]:
+    def _scan_document(self, doc: fitz.Document) -> tuple[str, list[dict]]:
         """
-        Find figure regions using hybrid approach:
+        Extract the full text and find figure regions in one pass.
+
+        Each page's text layer is read once in dict form; the plain page
+        text and the caption blocks both come from it. Figure regions use a
+        hybrid approach:
         1. Find embedded images on each page
         2. Find figure captions
         3. Match images to captions by proximity
@@ -383,16 +693,12 @@ class PdfParser:
             doc: PyMuPDF document
 
         Returns:
-            List of region dicts with page_num, fig_num, bbox, caption
+            (full_text, regions) where regions are dicts with page_num,
+            fig_num, bbox, caption
         """
+        # Page markers and page text go straight into one buffer
+        text_buf = io.StringIO()
         regions = []
-        # Strict caption pattern - must be start of block or have separator
-        # Matches: "Figure 1 |", "Figure 1.", "Figure 1:", "Fig. 2 -"
-        # Avoids: "see Figure 1 for", "in Figure 1, we"
-        caption_pattern = re.compile(
-            r"^(Figure|Fig\.?)\s+(\d+[a-zA-Z]?)\s*[\|\.\:\-]",
-            re.IGNORECASE | re.MULTILINE
-        )
 
         for page_num in range(len(doc)):
             page = doc[page_num]
@@ -402,16 +708,16 @@ class PdfParser:
             # Step 1: Find all visual content (images + large drawings)
             visual_rects = []
 
-            # Get embedded images
-            for img in page.get_images():
-                try:
-                    xref = img[0]
-                    rects = page.get_image_rects(xref)
-                    for rect in rects:
-                        if rect.width > 50 and rect.height > 50:
-                            visual_rects.append(rect)
-                except Exception:
+            # Get embedded images: get_image_info yields every placement
+            # with its bbox in one content-stream scan (xref 0 = inline
+            # image, which get_images never listed)
+            for info in page.get_image_info(xrefs=True):
+                # Intrinsic pixel size rules out icons and bullets
+                if not info["xref"] or info["width"] < 50 or info["height"] < 50:
                     continue
+                rect = fitz.Rect(info["bbox"])
+                if rect.width > 50 and rect.height > 50:
+                    visual_rects.append(rect)
 
             # Get large drawings (vector graphics - common in academic papers)
             for drawing in page.get_drawings():
@@ -424,54 +730,86 @@ class PdfParser:
             # Merge overlapping/adjacent rects into figure regions
             merged_rects = self._merge_image_rects(visual_rects)
 
-            # Step 2: Find caption text blocks
+            # Step 2: Find caption text blocks, collecting the page text
+            # line by line as get_text("text") would lay it out
             blocks = page.get_text("dict")["blocks"]
             captions = []
+            page_lines = []
+            block_texts = []
+            block_bboxes = []
 
             for block in blocks:
                 if block.get("type") != 0:
                     continue
 
-                block_text = ""
-                block_bbox = block.get("bbox", (0, 0, 0, 0))
-
-                for line in block.get("lines", []):
-                    for span in line.get("spans", []):
-                        block_text += span.get("text", "")
-
-                match = caption_pattern.search(block_text)
-                if match:
-                    fig_num = match.group(2)
-                    caption_text = block_text[match.start():].strip()
-                    captions.append({
-                        "fig_num": fig_num,
-                        "bbox": block_bbox,
-                        "caption": caption_text,
-                        "y_center": (block_bbox[1] + block_bbox[3]) / 2
-                    })
+                block_lines = [
+                    "".join([span.get("text", "") for span in line.get("spans", [])])
+                    for line in block.get("lines", [])
+                ]
+                page_lines.extend(block_lines)
+                block_texts.append("".join(block_lines))
+                block_bboxes.append(block.get("bbox", (0, 0, 0, 0)))
+
+            # One caption scan per page: blocks are joined by newlines so
+            # "^" still marks each block start, and start offsets map
+            # matches back to their block
+            scan_text = "\n".join(block_texts)
+            block_starts = []
+            offset = 0
+            for block_text in block_texts:
+                block_starts.append(offset)
+                offset += len(block_text) + 1
+
+            last_block = -1
+            for match in _FIGURE_CAPTION_START_RE.finditer(scan_text):
+                idx = bisect.bisect_right(block_starts, match.start()) - 1
+                if idx == last_block:
+                    continue  # First caption match per block only
+                block_end = block_starts[idx] + len(block_texts[idx])
+                if match.end() > block_end:
+                    # The match ran into the next block; search this block
+                    # on its own
+                    match = _FIGURE_CAPTION_START_RE.search(
+                        scan_text, block_starts[idx], block_end
+                    )
+                    if not match:
+                        continue
+                last_block = idx
+
+                block_bbox = block_bboxes[idx]
+                fig_num = match.group(2)
+                # Whitespace is normalized once here, as _scan_captions
+                # does for text captions; later stages rely on it
+                caption_text = " ".join(scan_text[match.start():block_end].split())
+                captions.append({
+                    "fig_num": fig_num,
+                    "bbox": block_bbox,
+                    "caption": caption_text,
+                    "y_center": (block_bbox[1] + block_bbox[3]) / 2
+                })
 
             # Step 3: Match images to captions
             used_rects = set()
+            # Rect bottoms read once per page rather than per caption
+            rect_bottoms = [rect.y1 for rect in merged_rects]
 
             for cap in captions:
-                cap_y = cap["y_center"]
+                cap_top = cap["bbox"][1]
+                limit = cap_top + 50  # Allow small overlap
                 best_rect = None
                 best_distance = float('inf')
 
                 # Find the closest image rect that's above the caption
-                for i, rect in enumerate(merged_rects):
-                    if i in used_rects:
-                        continue
-
+                for i, rect_bottom in enumerate(rect_bottoms):
                     # Image should be above or overlapping with caption
-                    rect_bottom = rect.y1
-                    distance = abs(rect_bottom - cap["bbox"][1])
+                    if rect_bottom > limit or i in used_rects:
+                        continue
 
                     # Prefer images directly above caption
-                    if rect_bottom <= cap["bbox"][1] + 50:  # Allow small overlap
-                        if distance < best_distance:
-                            best_distance = distance
-                            best_rect = (i, rect)
+                    distance = abs(rect_bottom - cap_top)
+                    if distance < best_distance:
+                        best_distance = distance
+                        best_rect = (i, merged_rects[i])
 
                 if best_rect:
                     idx, rect = best_rect
@@ -520,7 +858,12 @@ class PdfParser:
                         "caption": ""
                     })
 
-        return regions
+            text_buf.write(f"\n--- Page {page_num + 1} ---\n")
+            if page_lines:
+                text_buf.write("\n".join(page_lines))
+                text_buf.write("\n")
+
+        return text_buf.getvalue(), regions
 
     def _merge_image_rects(
         self,
@@ -540,38 +883,29 @@ class PdfParser:
         if not rects:
             return []
 
+        # Plain coordinate tuples: the merge loop compares floats instead of
+        # building fitz.Rect objects and calling intersects() per step.
         # Sort by y position then x
-        sorted_rects = sorted(rects, key=lambda r: (r.y0, r.x0))
+        boxes = sorted(
+            ((r.x0, r.y0, r.x1, r.y1) for r in rects),
+            key=lambda b: (b[1], b[0])
+        )
+        g = gap_threshold
         merged = []
-        current = None
-
-        for rect in sorted_rects:
-            if current is None:
-                current = fitz.Rect(rect)
+        cx0, cy0, cx1, cy1 = boxes[0]
+
+        for x0, y0, x1, y1 in boxes[1:]:
+            # Merge if they overlap or are close together (the current
+            # rect expanded by the gap intersects this one)
+            if cx0 - g < x1 and x0 < cx1 + g and cy0 - g < y1 and y0 < cy1 + g:
+                # Merge: expand current to include new rect
+                cx0, cy0 = min(cx0, x0), min(cy0, y0)
+                cx1, cy1 = max(cx1, x1), max(cy1, y1)
             else:
-                # Check if rects should be merged
-                # Merge if they overlap or are close together
-                expanded = fitz.Rect(
-                    current.x0 - gap_threshold,
-                    current.y0 - gap_threshold,
-                    current.x1 + gap_threshold,
-                    current.y1 + gap_threshold
-                )
-
-                if expanded.intersects(rect):
-                    # Merge: expand current to include new rect
-                    current = fitz.Rect(
-                        min(current.x0, rect.x0),
-                        min(current.y0, rect.y0),
-                        max(current.x1, rect.x1),
-                        max(current.y1, rect.y1)
-                    )
-                else:
-                    merged.append(current)
-                    current = fitz.Rect(rect)
+                merged.append(fitz.Rect(cx0, cy0, cx1, cy1))
+                cx0, cy0, cx1, cy1 = x0, y0, x1, y1
 
-        if current is not None:
-            merged.append(current)
+        merged.append(fitz.Rect(cx0, cy0, cx1, cy1))
 
         return merged
 
@@ -594,42 +928,78 @@ class PdfParser:
         figures = []
         figure_counter = 1
         min_dimension = 150  # Minimum width/height in pixels
+        seen_xrefs: set[int] = set()  # images repeated across pages (logos)
 
         for page_num in range(len(doc)):
             page = doc[page_num]
-            image_list = page.get_images()
 
-            # Collect all significant images on this page with their positions
+            # Collect all significant images on this page with their
+            # positions; one get_image_info scan gives xref and bbox
             page_images = []
-            for img in image_list:
-                try:
-                    xref = img[0]
-                    img_rects = page.get_image_rects(xref)
-                    if not img_rects:
-                        continue
-
-                    rect = img_rects[0]
-                    width = rect.width
-                    height = rect.height
+            for info in page.get_image_info(xrefs=True):
+                xref = info["xref"]
+                if (not xref or xref in seen_xrefs
+                        or info["width"] < 50 or info["height"] < 50):
+                    continue
+                # First placement only, as images repeat (logos)
+                seen_xrefs.add(xref)
 
-                    # Skip small images
-                    if width < min_dimension or height < min_dimension:
-                        continue
+                rect = fitz.Rect(info["bbox"])
+                width = rect.width
+                height = rect.height
 
-                    page_images.append({
-                        "xref": xref,
-                        "rect": rect,
-                        "area": width * height
-                    })
-                except Exception:
+                # Skip small images
+                if width < min_dimension or height < min_dimension:
                     continue
 
+                page_images.append({
+                    "xref": xref,
+                    "rect": rect,
+                    "area": width * height
+                })
+
             # Group overlapping/adjacent images
             grouped = self._group_nearby_images(page_images)
 
             # Render and extract each group
             for group in grouped:
                 try:
+                    # A lone image is saved from its own pixels rather than
+                    # rendered, decoded by Pillow and re-encoded
+                    # (soft-masked images are rendered so the mask applies)
+                    if len(group) == 1:
+                        xref = group[0]["xref"]
+                        raw = doc.extract_image(xref)
+                        if (raw and not raw["smask"]
+                                and raw["width"] >= 200 and raw["height"] >= 200):
+                            figure_id = f"figure_{figure_counter}"
+                            if (raw["ext"] in self.PASSTHROUGH_IMAGE_EXTS
+                                    and raw["colorspace"] in (1, 3)):
+                                # Gray/RGB PNG or JPEG: write the embedded
+                                # bytes verbatim
+                                image_path = figures_dir / f"{figure_id}.{raw['ext']}"
+                                image_path.write_bytes(raw["image"])
+                            else:
+                                # JPX, JBIG2, CMYK or Adobe-inverted JPEG, ...:
+                                # MuPDF decodes, converts to RGB and writes PNG
+                                pix = fitz.Pixmap(doc, xref)
+                                if pix.n - pix.alpha > 3:  # CMYK and friends
+                                    pix = fitz.Pixmap(fitz.csRGB, pix)
+                                image_path = figures_dir / f"{figure_id}.png"
+                                pix.save(str(image_path))
+                                pix = None
+
+                            rect = group[0]["rect"]
+                            figures.append(Figure(
+                                figure_id=figure_id,
+                                page_number=page_num + 1,
+                                bbox=(rect.x0, rect.y0, rect.x1, rect.y1),
+                                image_path=image_path,
+                                caption=""
+                            ))
+                            figure_counter += 1
+                            continue
+
                     # Calculate bounding box for the group
                     x0 = min(img["rect"].x0 for img in group)
                     y0 = min(img["rect"].y0 for img in group)
@@ -649,17 +1019,19 @@ class PdfParser:
                     clip = fitz.Rect(x0, y0, x1, y1)
                     pix = page.get_pixmap(matrix=mat, clip=clip)
 
-                    img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-
-                    # Skip if still too small
-                    if img.width < 200 or img.height < 200:
+                    # Skip if still too small (pixmaps are released right
+                    # away rather than held until the next render)
+                    if pix.width < 200 or pix.height < 200:
+                        pix = None
                         continue
 
-                    # Save figure
+                    # Save figure straight from the pixmap (PNG written by
+                    # MuPDF, no copy into a Pillow image)
                     figure_id = f"figure_{figure_counter}"
                     image_filename = f"{figure_id}.png"
                     image_path = figures_dir / image_filename
-                    img.save(image_path, "PNG", optimize=True)
+                    pix.save(str(image_path))
+                    pix = None
 
                     figures.append(Figure(
                         figure_id=figure_id,
@@ -696,43 +1068,67 @@ class PdfParser:
         # Sort by position (top-left)
         images = sorted(images, key=lambda x: (x["rect"].y0, x["rect"].x0))
 
-        groups = []
-        used = set()
-
-        for i, img in enumerate(images):
-            if i in used:
-                continue
+        # Union-find over image indices; images within threshold of each
+        # other end up in the same group
+        parent = list(range(len(images)))
 
-            group = [img]
-            used.add(i)
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]  # Path halving
+                i = parent[i]
+            return i
 
-            # Find nearby images
-            for j, other in enumerate(images):
-                if j in used:
-                    continue
+        threshold_sq = threshold * threshold
+        for i, img in enumerate(images):
+            r1 = img["rect"]
+            for j in range(i + 1, len(images)):
+                r2 = images[j]["rect"]
 
-                # Check if rectangles are close
-                r1, r2 = img["rect"], other["rect"]
+                # Sorted by y0: once the vertical gap alone reaches the
+                # threshold, no later image can be close enough
+                if r2.y0 - r1.y1 >= threshold:
+                    break
 
-                # Calculate distance between rectangles
+                # Squared distance between rectangles (no sqrt needed)
                 dx = max(0, max(r1.x0, r2.x0) - min(r1.x1, r2.x1))
                 dy = max(0, max(r1.y0, r2.y0) - min(r1.y1, r2.y1))
-                distance = (dx ** 2 + dy ** 2) ** 0.5
+                if dx * dx + dy * dy < threshold_sq:
+                    root_i, root_j = find(i), find(j)
+                    if root_i != root_j:
+                        parent[root_j] = root_i
 
-                if distance < threshold:
-                    group.append(other)
-                    used.add(j)
+        # Collect groups by root, in order of each group's first image
+        groups: dict[int, list[dict]] = {}
+        for i, img in enumerate(images):
+            groups.setdefault(find(i), []).append(img)
 
-            groups.append(group)
+        return list(groups.values())
 
-        return groups
+    def _table_pages(self, full_text: str) -> list[int]:
+        """
+        Find the pages (0-based) whose text mentions a numbered table.
 
-    def _extract_tables(self, pdf_path: Path) -> list[Table]:
+        Table detection is the slowest extraction stage, so it only runs on
+        these pages; papers without any table mention skip it entirely.
+        """
+        pages = []
+        page = -1
+        for match in _TABLE_PAGE_SCAN_RE.finditer(full_text):
+            if match.group(1):
+                page += 1
+            elif page >= 0 and (not pages or pages[-1] != page):
+                pages.append(page)
+        return pages
+
+    def _extract_tables(
+        self, doc: fitz.Document, page_nums: list[int]
+    ) -> list[Table]:
         """
-        Extract tables from PDF using pdfplumber.
+        Extract tables from PDF using PyMuPDF's table finder.
 
         Args:
-            pdf_path: Path to PDF
+            doc: PyMuPDF document
+            page_nums: Pages (0-based) to search, in order
 
         Returns:
             List of Table objects
@@ -740,33 +1136,35 @@ class PdfParser:
         tables = []
         table_counter = 1
 
-        with pdfplumber.open(pdf_path) as pdf:
-            for page_num, page in enumerate(pdf.pages):
-                page_tables = page.find_tables()
+        for page_num in page_nums:
+            try:
+                page_tables = doc[page_num].find_tables().tables
+            except Exception:
+                continue
 
-                for table in page_tables:
-                    try:
-                        # Extract table data
-                        table_data = table.extract()
-                        if not table_data:
-                            continue
+            for table in page_tables:
+                try:
+                    # Extract table data
+                    table_data = table.extract()
+                    if not table_data:
+                        continue
 
-                        # Get bounding box
-                        bbox = table.bbox
+                    # Get bounding box
+                    bbox = tuple(table.bbox)
 
-                        table_id = f"table_{table_counter}"
-                        tables.append(Table(
-                            table_id=table_id,
-                            page_number=page_num + 1,
-                            bbox=bbox,
-                            data=table_data
-                        ))
+                    table_id = f"table_{table_counter}"
+                    tables.append(Table(
+                        table_id=table_id,
+                        page_number=page_num + 1,
+                        bbox=bbox,
+                        data=table_data
+                    ))
 
-                        table_counter += 1
+                    table_counter += 1
 
-                    except Exception as e:
-                        # Skip problematic tables
-                        continue
+                except Exception as e:
+                    # Skip problematic tables
+                    continue
 
         return tables
 
@@ -793,18 +1191,7 @@ class PdfParser:
             return figures
 
         # Find all figure captions in text
-        caption_pattern = re.compile(
-            r"(Figure|Fig\.?)\s+(\d+[a-zA-Z]?)[:\.\s]+(.+?)(?=\n\n|Figure|Fig\.|Table|\n[A-Z][a-z]+\s+\d+|$)",
-            re.IGNORECASE | re.DOTALL
-        )
-
-        captions = {}
-        for match in caption_pattern.finditer(full_text):
-            fig_num = match.group(2)
-            caption_text = match.group(3).strip()
-            # Clean up caption (remove excessive whitespace)
-            caption_text = re.sub(r'\s+', ' ', caption_text)
-            captions[fig_num] = caption_text
+        captions = _scan_captions(full_text)[0]
 
         # Match captions to figures that don't have one
         for figure in figures:
@@ -812,12 +1199,14 @@ class PdfParser:
                 continue  # Already has caption from extraction
 
             # Extract figure number from figure_id (e.g., "figure_1" -> "1")
-            fig_num = figure.figure_id.replace("figure_", "")
+            fig_num = figure.figure_id.removeprefix("figure_")
             if fig_num in captions:
                 figure.caption = captions[fig_num]
-            elif f"{fig_num}a" in captions:
+            else:
                 # Handle subfigures
-                figure.caption = captions[f"{fig_num}a"]
+                sub_caption = captions.get(fig_num + "a")
+                if sub_caption is not None:
+                    figure.caption = sub_caption
 
         return figures
 
@@ -837,18 +1226,7 @@ class PdfParser:
             Updated list of tables with captions
         """
         # Find all table captions in text
-        caption_pattern = re.compile(
-            r"(Table|Tbl\.?)\s+(\d+[a-zA-Z]?)[:\.\s]+(.+?)(?=\n\n|Table|Tbl\.|Figure|\n[A-Z][a-z]+\s+\d+|$)",
-            re.IGNORECASE | re.DOTALL
-        )
-
-        captions = {}
-        for match in caption_pattern.finditer(full_text):
-            tbl_num = match.group(2)
-            caption_text = match.group(3).strip()
-            # Clean up caption
-            caption_text = re.sub(r'\s+', ' ', caption_text)
-            captions[tbl_num] = caption_text
+        captions = _scan_captions(full_text)[1]
 
         # Match captions to tables
         for i, table in enumerate(tables):
@@ -877,50 +1255,11 @@ class PdfParser:
             return StructuredCaption(title="", sub_captions=[])
 
         # Clean up the text
-        text = re.sub(r'\s+', ' ', caption_text).strip()
-
-        # Pattern to match sub-figure labels: (A), (a), a), A., a.
-        sub_pattern = re.compile(
-            r'[\(\|]\s*([A-Za-z])\s*[\)\.\,\|]|'  # (A) or |A| or A) or A.
-            r'\b([a-z])\s*[,;]\s+(?=[A-Z])',       # a, Description
-            re.IGNORECASE
-        )
-
-        # Find all sub-caption markers
-        matches = list(sub_pattern.finditer(text))
-
-        if not matches:
-            # No sub-captions found, entire text is the title
-            return StructuredCaption(title=text, sub_captions=[])
-
-        # Title is everything before the first sub-caption marker
-        first_match = matches[0]
-        title = text[:first_match.start()].strip()
-
-        # Remove trailing punctuation from title
-        title = re.sub(r'[\.\:\|\-]+$', '', title).strip()
-
-        # Extract sub-captions
-        sub_captions = []
-        for i, match in enumerate(matches):
-            label = match.group(1) or match.group(2)
-            label = label.upper()  # Normalize to uppercase
-
-            # Find the text for this sub-caption
-            start = match.end()
-            if i + 1 < len(matches):
-                end = matches[i + 1].start()
-            else:
-                end = len(text)
-
-            sub_text = text[start:end].strip()
-            # Clean up trailing punctuation before next label
-            sub_text = re.sub(r'[\.\;\,\|]+$', '', sub_text).strip()
-
-            if sub_text:
-                sub_captions.append(SubCaption(label=label, text=sub_text))
+        return self._parse_normalized_caption(' '.join(caption_text.split()))
 
-        return StructuredCaption(title=title, sub_captions=sub_captions)
+    def _parse_normalized_caption(self, text: str) -> StructuredCaption:
+        """parse_structured_caption for text with whitespace already collapsed."""
+        return _to_structured_caption(_parse_caption_cached(text))
 
     def add_structured_captions(self, figures: list[Figure]) -> list[Figure]:
         """
@@ -932,9 +1271,21 @@ class PdfParser:
         Returns:
             Updated figures with structured_caption field populated
         """
-        for figure in figures:
-            if figure.caption and not figure.structured_caption:
-                figure.structured_caption = self.parse_structured_caption(figure.caption)
+        # Extracted and matched captions are already whitespace-normalized
+        pending = [
+            figure for figure in figures
+            if figure.caption and not figure.structured_caption
+        ]
+
+        if len(pending) > self.BATCH_CAPTION_MIN:
+            # Many captions: scan the distinct ones in one regex pass
+            texts = list(dict.fromkeys(figure.caption for figure in pending))
+            parsed = dict(zip(texts, _parse_captions_batch(texts)))
+            for figure in pending:
+                figure.structured_caption = _to_structured_caption(parsed[figure.caption])
+        else:
+            for figure in pending:
+                figure.structured_caption = self._parse_normalized_caption(figure.caption)
         return figures
 
     def extract_figure_references(
@@ -955,45 +1306,55 @@ class PdfParser:
         Returns:
             Updated figures with references populated
         """
-        # Pattern to find figure references with surrounding context
-        # Matches: Fig. 1, Figure 1A, Fig. 1a, Figs. 1-3, Figure 1 (A), etc.
-        ref_pattern = re.compile(
-            r'([^.]*?'  # Context before
-            r'(?:Fig(?:ure|s)?\.?\s*'  # Figure/Fig./Figs.
-            r'(\d+)\s*'  # Figure number
-            r'([A-Za-z])?'  # Optional sub-label
-            r'(?:\s*[-–]\s*\d+[A-Za-z]?)?'  # Optional range
-            r'(?:\s*\([A-Za-z]\))?'  # Optional (A) format
-            r')'
-            r'[^.]*\.)',  # Context after until period
-            re.IGNORECASE
-        )
-
-        # Track which page we're on based on page markers
-        current_page = 1
-        page_pattern = re.compile(r'--- Page (\d+) ---')
-
-        # Split text by pages
-        page_texts = re.split(r'--- Page \d+ ---', full_text)
-
-        all_references: dict[str, list[FigureReference]] = {}
-
-        for page_idx, page_text in enumerate(page_texts):
-            page_num = page_idx  # 0-indexed, first split is before page 1
-
-            for match in ref_pattern.finditer(page_text):
-                sentence = match.group(0).strip()
-                fig_num = match.group(2)
-                sub_label = match.group(3) or ""
-
-                # Clean up the sentence
-                sentence = re.sub(r'\s+', ' ', sentence)
+        # Page spans between markers; each is scanned in place with
+        # pos/endpos instead of splitting the text into per-page copies
+        page_starts = [0]
+        page_ends = []
+        for marker in _PAGE_MARKER_RE.finditer(full_text):
+            page_ends.append(marker.start())
+            page_starts.append(marker.end())
+        page_ends.append(len(full_text))
+
+        all_references: defaultdict[str, list[FigureReference]] = defaultdict(list)
+
+        # 0-indexed, first span is before page 1
+        for page_num, (start, end) in enumerate(zip(page_starts, page_ends)):
+            # Collect (position, number, sub-label) for every figure token on
+            # the page in one pass; pages without any are skipped before
+            # sentence splitting
+            tokens = [
+                (match.start(), match[1], match[2])
+                for match in _FIGURE_REF_RE.finditer(full_text, start, end)
+            ]
+            if not tokens:
+                continue
 
-                # Create reference key (e.g., "1", "1A")
-                ref_key = f"{fig_num}{sub_label.upper()}"
+            # Sentence spans for this page. Figure tokens are mapped to their
+            # sentence, so no pattern has to scan back and forth for the
+            # surrounding periods
+            sentence_starts = [start]
+            sentence_ends = []
+            for brk in _SENTENCE_BREAK_RE.finditer(full_text, start, end):
+                sentence_ends.append(brk.start())
+                sentence_starts.append(brk.end())
+            sentence_ends.append(end)
+
+            sentences: dict[int, str] = {}
+            for pos, ref_key, sub_label in tokens:
+                idx = bisect.bisect_right(sentence_starts, pos) - 1
+                sentence = sentences.get(idx)
+                if sentence is None:
+                    # Clean up the sentence
+                    sentence = ' '.join(
+                        full_text[sentence_starts[idx]:sentence_ends[idx]].split()
+                    )
+                    sentences[idx] = sentence
 
-                if ref_key not in all_references:
-                    all_references[ref_key] = []
+                # Create reference key (e.g., "1", "1A"); interned, as the
+                # few distinct keys repeat across many references
+                if sub_label:
+                    ref_key += sub_label if sub_label.isupper() else sub_label.upper()
+                ref_key = sys.intern(ref_key)
 
                 all_references[ref_key].append(FigureReference(
                     text=sentence,
@@ -1001,10 +1362,10 @@ class PdfParser:
                     figure_label=ref_key
                 ))
 
-        # Associate references with figures
-        for figure in figures:
-            # Extract figure number from figure_id
-            fig_num = figure.figure_id.replace("figure_", "")
+        # Associate references with figures; figure numbers are taken off
+        # the figure_id prefix once, up front
+        fig_nums = [sys.intern(figure.figure_id.removeprefix("figure_")) for figure in figures]
+        for figure, fig_num in zip(figures, fig_nums):
 
             if figure.structured_caption is None:
                 figure.structured_caption = StructuredCaption(title=figure.caption)
@@ -1013,9 +1374,12 @@ class PdfParser:
             if fig_num in all_references:
                 figure.structured_caption.references.extend(all_references[fig_num])
 
-            # Add sub-figure specific references
+            # Add sub-figure specific references. Labels from the caption
+            # parser are already uppercase, but ones restored by
+            # StructuredCaption.from_dict or set by the sub-figure detector
+            # may not be
             for sub_cap in figure.structured_caption.sub_captions:
-                sub_key = f"{fig_num}{sub_cap.label.upper()}"
+                sub_key = sys.intern(fig_num + sub_cap.label.upper())
                 if sub_key in all_references:
                     sub_cap.references.extend(all_references[sub_key])
 
@@ -1023,9 +1387,5 @@ class PdfParser:
 
     async def close(self):
         """Cleanup resources."""
+        self._finalizer.detach()
         self._executor.shutdown(wait=True)
-
-    def __del__(self):
-        """Ensure cleanup on deletion."""
-        if hasattr(self, '_executor'):
-            self._executor.shutdown(wait=False)
@@ -20,6 +20,14 @@ PRICING: dict[str, dict[str, float]] = {
     "claude-sonnet-4-5-20250929": {"input": 3.00, "output": 15.00},
 }
 
+# Per-token (input, output) rates derived from PRICING once at import, so
+# calc_cost is one dict lookup and two multiplies
+_RATES: dict[str, tuple[float, float]] = {
+    model: (prices["input"] / 1_000_000, prices["output"] / 1_000_000)
+    for model, prices in PRICING.items()
+}
+_DEFAULT_RATES = _RATES["gemini-3-flash-preview"]
+
 
 def calc_cost(model: str, input_tokens: int, output_tokens: int) -> float:
     """
@@ -33,7 +41,5 @@ def calc_cost(model: str, input_tokens: int, output_tokens: int) -> float:
     Returns:
         Total cost in USD, rounded to 8 decimal places
     """
-    pricing = PRICING.get(model, PRICING["gemini-3-flash-preview"])
-    cost = (input_tokens / 1_000_000) * pricing["input"] + \
-           (output_tokens / 1_000_000) * pricing["output"]
-    return round(cost, 8)
+    rate_in, rate_out = _RATES.get(model, _DEFAULT_RATES)
+    return round(input_tokens * rate_in + output_tokens * rate_out, 8)
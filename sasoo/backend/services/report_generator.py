@@ -14,14 +14,66 @@ Also generates a separate recipe_card.md file.
 
 from __future__ import annotations
 
+import asyncio
+import io
 import json
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 logger = logging.getLogger(__name__)
 
+# Written between report sections; each section already ends in a newline
+_SECTION_SEPARATOR = "\n---\n\n"
+
+# Fixed-layout blocks, filled in one format pass per report
+_HEADER_TMPL = (
+    "# {title}\n\n"
+    "> Authors: {authors}\n"
+    "> Journal: {journal} | Year: {year} | DOI: {doi}\n"
+    "> Analysis Agent: Agent {agent} ({domain})\n"
+    "> Analysis Date: {now}\n"
+)
+_COST_SUMMARY_TMPL = (
+    "## Analysis Cost Summary\n\n"
+    "| Metric | Value |\n"
+    "|--------|-------|\n"
+    "| Total Cost | ${total_cost:.4f} |\n"
+    "| Input Tokens | {total_in:,} |\n"
+    "| Output Tokens | {total_out:,} |\n"
+)
+
+# Table header rows
+_QUALITY_TABLE_HEAD = "| Figure | Quality | Notes |\n|--------|---------|-------|\n"
+_PARAMETER_TABLE_HEAD = (
+    "| Parameter | Value | Unit | Source | Status |\n"
+    "|-----------|-------|------|--------|--------|\n"
+)
+_PHASE_COST_TABLE_HEAD = (
+    "| Phase | Model | Cost | Duration |\n"
+    "|-------|-------|------|----------|\n"
+)
+
+
+class _TemplateFields(dict):
+    """format_map() mapping that renders missing fields as empty strings."""
+
+    def __missing__(self, key: str) -> str:
+        return ""
+
+
+def _save_markdown(paper_dir: Path, files: dict[str, str]) -> None:
+    """
+    Write Markdown files (name -> text) into paper_dir, creating it.
+
+    Runs in a worker thread; all of a report's files go in one call, so
+    they cost one thread handoff and one mkdir.
+    """
+    paper_dir.mkdir(parents=True, exist_ok=True)
+    for name, text in files.items():
+        (paper_dir / name).write_text(text, encoding="utf-8")
+
 
 class ReportGenerator:
     """
@@ -76,33 +128,35 @@ class ReportGenerator:
         recipe = self._get_phase_result(phases, "recipe")
         deep_dive = self._get_phase_result(phases, "deep_dive")
 
-        # Build report sections
-        sections: list[str] = []
-        sections.append(self._build_header(paper_meta))
-        sections.append(self._build_phase1_screening(screening))
-        sections.append(self._build_phase2_visual(visual, paper_dir))
-        sections.append(self._build_phase3_recipe(recipe, mermaid_outputs))
-        sections.append(self._build_phase4_deep_dive(deep_dive))
-        sections.append(self._build_paperbanana_section(pb_paths, paper_dir))
-        sections.append(self._build_cost_summary(analysis_report))
-
-        report_md = "\n\n---\n\n".join([s for s in sections if s])
-
-        # Save analysis.md
-        output_path = Path(paper_dir) / "analysis.md"
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(report_md, encoding="utf-8")
-        logger.info("Report saved to %s", output_path)
-
-        # Also generate separate recipe_card.md
+        # Build report sections into one buffer; every section ends with a
+        # newline, so the "\n\n---\n\n" join becomes "\n---\n\n"
+        # separators plus one trailing newline trimmed at the end
+        buf = io.StringIO()
+        self._build_header(buf, paper_meta)
+        self._write_section(buf, self._build_phase1_screening, screening)
+        self._write_section(buf, self._build_phase2_visual, visual, paper_dir)
+        self._write_section(buf, self._build_phase3_recipe, recipe, mermaid_outputs)
+        self._write_section(buf, self._build_phase4_deep_dive, deep_dive)
+        self._write_section(buf, self._build_paperbanana_section, pb_paths, paper_dir)
+        self._write_section(buf, self._build_cost_summary, analysis_report)
+        buf.seek(buf.tell() - 1)
+        buf.truncate()
+        report_md = buf.getvalue()
+
+        # Save analysis.md and, if there is a recipe, the separate
+        # recipe_card.md, off the event loop as a single batch
+        out_dir = Path(paper_dir)
+        files = {"analysis.md": report_md}
         if recipe:
-            recipe_path = await self.generate_recipe_card(
-                paper_id=paper_id,
-                paper_meta=paper_meta,
-                recipe_result=recipe,
-                paper_dir=paper_dir,
+            files["recipe_card.md"] = self._build_recipe_card(
+                paper_id, paper_meta, recipe
             )
-            logger.info("Recipe card saved to %s", recipe_path)
+        await asyncio.to_thread(_save_markdown, out_dir, files)
+
+        output_path = out_dir / "analysis.md"
+        logger.info("Report saved to %s", output_path)
+        if recipe:
+            logger.info("Recipe card saved to %s", out_dir / "recipe_card.md")
 
         return str(output_path)
 
@@ -125,6 +179,21 @@ class ReportGenerator:
         Returns:
             File path to recipe_card.md.
         """
+        recipe_md = self._build_recipe_card(paper_id, paper_meta, recipe_result)
+
+        await asyncio.to_thread(
+            _save_markdown, Path(paper_dir), {"recipe_card.md": recipe_md}
+        )
+
+        return str(Path(paper_dir) / "recipe_card.md")
+
+    def _build_recipe_card(
+        self,
+        paper_id: int,
+        paper_meta: dict[str, Any],
+        recipe_result: dict[str, Any],
+    ) -> str:
+        """Build the recipe_card.md Markdown for generate_recipe_card."""
         title = paper_meta.get("title", "Untitled Paper")
         recipe_card = recipe_result.get("recipe", recipe_result)
 
@@ -227,46 +296,47 @@ class ReportGenerator:
                 lines.append(f"- Reproducibility Score: {reproducibility:.0%}")
             lines.append("")
 
-        recipe_md = "\n".join(lines)
-
-        output_path = Path(paper_dir) / "recipe_card.md"
-        output_path.write_text(recipe_md, encoding="utf-8")
-
-        return str(output_path)
+        return "\n".join(lines)
 
     # ------------------------------------------------------------------
     # Section Builders
+    #
+    # Each builder writes its section into the shared report buffer, one
+    # "\n"-terminated line at a time, and writes nothing if the section is
+    # to be omitted.
     # ------------------------------------------------------------------
 
-    def _build_header(self, meta: dict[str, Any]) -> str:
+    def _write_section(
+        self, buf: io.StringIO, build: Callable[..., None], *args: Any
+    ) -> None:
+        """Append a section after a separator, dropping both if it is empty."""
+        mark = buf.tell()
+        buf.write(_SECTION_SEPARATOR)
+        start = buf.tell()
+        build(buf, *args)
+        if buf.tell() == start:
+            buf.seek(mark)
+            buf.truncate()
+
+    def _build_header(self, buf: io.StringIO, meta: dict[str, Any]) -> None:
         """Build the report header matching PRD F6 format."""
-        title = meta.get("title", "Untitled Paper")
-        authors = meta.get("authors", "")
-        journal = meta.get("journal", "")
-        year = meta.get("year", "")
-        doi = meta.get("doi", "")
-        agent = meta.get("agent_used", "photon")
-        domain = meta.get("domain", "optics")
-        now = datetime.now().strftime("%Y-%m-%d %H:%M")
-
-        lines = [
-            f"# {title}",
-            "",
-            f"> Authors: {authors}",
-            f"> Journal: {journal} | Year: {year} | DOI: {doi}",
-            f"> Analysis Agent: Agent {agent.capitalize()} ({domain.capitalize()})",
-            f"> Analysis Date: {now}",
-        ]
-        return "\n".join(lines)
-
-    def _build_phase1_screening(self, result: Optional[dict]) -> str:
+        fields = _TemplateFields(meta)
+        fields.setdefault("title", "Untitled Paper")
+        fields["agent"] = meta.get("agent_used", "photon").capitalize()
+        fields["domain"] = meta.get("domain", "optics").capitalize()
+        fields["now"] = datetime.now().strftime("%Y-%m-%d %H:%M")
+        buf.write(_HEADER_TMPL.format_map(fields))
+
+    def _build_phase1_screening(
+        self, buf: io.StringIO, result: Optional[dict]
+    ) -> None:
         """Build Phase 1: Screening section."""
-        lines = ["## Phase 1: Screening"]
-        lines.append("")
+        write = buf.write
+        write("## Phase 1: Screening\n\n")
 
         if result is None:
-            lines.append("*Phase 1 was not completed.*")
-            return "\n".join(lines)
+            write("*Phase 1 was not completed.*\n")
+            return
 
         # Relevance
         relevance = result.get("relevance_score", result.get("relevance", "N/A"))
@@ -282,52 +352,51 @@ class ReportGenerator:
             relevance_display = str(relevance)
             stars = str(relevance)
 
-        lines.append(f"- **Relevance**: {relevance_display}")
+        write(f"- **Relevance**: {relevance_display}\n")
 
         # Keywords
         keywords = result.get("key_topics", result.get("keywords", []))
         if keywords:
             if isinstance(keywords, list):
-                lines.append(f"- **Keywords**: {', '.join(keywords)}")
+                write(f"- **Keywords**: {', '.join(keywords)}\n")
             else:
-                lines.append(f"- **Keywords**: {keywords}")
+                write(f"- **Keywords**: {keywords}\n")
 
         # Summary
         summary = result.get("summary", result.get("one_line_summary", ""))
         if summary:
-            lines.append(f"- **Summary**: {summary}")
+            write(f"- **Summary**: {summary}\n")
 
         # Methodology type
         methodology = result.get("methodology_type", "")
         if methodology:
-            lines.append(f"- **Methodology**: {methodology}")
+            write(f"- **Methodology**: {methodology}\n")
 
         # Complexity
         complexity = result.get("estimated_complexity", "")
         if complexity:
-            lines.append(f"- **Estimated Complexity**: {complexity}")
+            write(f"- **Estimated Complexity**: {complexity}\n")
 
         # Flags
         is_experimental = result.get("is_experimental", None)
         if is_experimental is not None:
-            lines.append(f"- **Experimental Paper**: {'Yes' if is_experimental else 'No'}")
-
-        return "\n".join(lines)
+            write(f"- **Experimental Paper**: {'Yes' if is_experimental else 'No'}\n")
 
-    def _build_phase2_visual(self, result: Optional[dict], paper_dir: str) -> str:
+    def _build_phase2_visual(
+        self, buf: io.StringIO, result: Optional[dict], paper_dir: str
+    ) -> None:
         """Build Phase 2: Visual Verification section with figure gallery."""
-        lines = ["## Phase 2: Visual Verification"]
-        lines.append("")
+        write = buf.write
+        write("## Phase 2: Visual Verification\n\n")
 
         if result is None:
-            lines.append("*Phase 2 was not completed.*")
-            return "\n".join(lines)
+            write("*Phase 2 was not completed.*\n")
+            return
 
         # Figure Gallery
         figures = result.get("figures", result.get("figure_analyses", []))
         if figures and isinstance(figures, list):
-            lines.append("### Figure Gallery")
-            lines.append("")
+            write("### Figure Gallery\n\n")
             for fig in figures:
                 fig_id = fig.get("figure_id", fig.get("figure_num", ""))
                 caption = fig.get("caption", "")
@@ -339,74 +408,67 @@ class ReportGenerator:
                 # Image reference (relative path)
                 if file_path:
                     rel_path = self._relative_path(file_path, paper_dir)
-                    lines.append(f"![{fig_id}]({rel_path})")
-                lines.append(f"**{fig_id}**: {caption}")
+                    write(f"![{fig_id}]({rel_path})\n")
+                write(f"**{fig_id}**: {caption}\n")
                 if interpretation:
-                    lines.append(f"> AI Analysis: {interpretation}")
+                    write(f"> AI Analysis: {interpretation}\n")
                 if warnings:
                     for w in warnings:
-                        lines.append(f"> :warning: {w}")
-                lines.append("")
+                        write(f"> :warning: {w}\n")
+                write("\n")
 
         # Data Quality Table
         if figures and isinstance(figures, list):
-            lines.append("### Data Quality Assessment")
-            lines.append("")
-            lines.append("| Figure | Quality | Notes |")
-            lines.append("|--------|---------|-------|")
+            write("### Data Quality Assessment\n\n")
+            write(_QUALITY_TABLE_HEAD)
             for fig in figures:
                 fig_id = fig.get("figure_id", fig.get("figure_num", "?"))
                 quality = fig.get("quality", fig.get("data_quality", "N/A"))
                 quality_icon = self._quality_icon(quality)
                 notes = fig.get("quality_notes", fig.get("notes", ""))
-                lines.append(f"| {fig_id} | {quality_icon} | {notes} |")
-            lines.append("")
+                write(f"| {fig_id} | {quality_icon} | {notes} |\n")
+            write("\n")
 
         # Summary stats
         summary = result.get("quality_summary", "")
         if summary:
-            lines.append(f"**Quality Summary**: {summary}")
-            lines.append("")
+            write(f"**Quality Summary**: {summary}\n\n")
 
         figure_count = result.get("figure_count", len(figures) if figures else 0)
         tables_found = result.get("tables_found", 0)
         equations_found = result.get("equations_found", 0)
         if any([figure_count, tables_found, equations_found]):
-            lines.append(
+            write(
                 f"Figures: {figure_count} | Tables: {tables_found} | "
-                f"Equations: {equations_found}"
+                f"Equations: {equations_found}\n"
             )
 
-        return "\n".join(lines)
-
     def _build_phase3_recipe(
         self,
+        buf: io.StringIO,
         result: Optional[dict],
         mermaid_outputs: list,
-    ) -> str:
+    ) -> None:
         """Build Phase 3: Recipe Card section with parameter table and Mermaid."""
-        lines = ["## Phase 3: Recipe Card"]
-        lines.append("")
+        write = buf.write
+        write("## Phase 3: Recipe Card\n\n")
 
         if result is None:
-            lines.append("*Phase 3 was not completed.*")
-            return "\n".join(lines)
+            write("*Phase 3 was not completed.*\n")
+            return
 
         recipe_card = result.get("recipe", result)
 
         # Objective
         objective = recipe_card.get("objective", "")
         if objective:
-            lines.append(f"**Objective**: {objective}")
-            lines.append("")
+            write(f"**Objective**: {objective}\n\n")
 
         # Parameter Table
         parameters = recipe_card.get("parameters", [])
         if parameters:
-            lines.append("### Experiment Parameters")
-            lines.append("")
-            lines.append("| Parameter | Value | Unit | Source | Status |")
-            lines.append("|-----------|-------|------|--------|--------|")
+            write("### Experiment Parameters\n\n")
+            write(_PARAMETER_TABLE_HEAD)
             for param in parameters:
                 if isinstance(param, dict):
                     name = param.get("name", "")
@@ -415,40 +477,36 @@ class ReportGenerator:
                     source = param.get("source", param.get("notes", ""))
                     status = param.get("status", "EXPLICIT")
                     status_icon = self._status_icon(status)
-                    lines.append(f"| {name} | {value} | {unit} | {source} | {status_icon} |")
-            lines.append("")
+                    write(f"| {name} | {value} | {unit} | {source} | {status_icon} |\n")
+            write("\n")
 
         # Missing Parameter Warnings
         missing = result.get("missing_info", recipe_card.get("missing_info", []))
         if missing:
-            lines.append("### Missing Parameter Warnings")
-            lines.append("")
+            write("### Missing Parameter Warnings\n\n")
             for item in missing:
-                lines.append(f"- :warning: {item}")
-            lines.append("")
+                write(f"- :warning: {item}\n")
+            write("\n")
 
         # Steps
         steps = recipe_card.get("steps", [])
         if steps:
-            lines.append("### Procedure Steps")
-            lines.append("")
+            write("### Procedure Steps\n\n")
             for i, step in enumerate(steps, 1):
-                lines.append(f"{i}. {step}")
-            lines.append("")
+                write(f"{i}. {step}\n")
+            write("\n")
 
         # Critical notes
         critical = recipe_card.get("critical_notes", [])
         if critical:
-            lines.append("### Critical Notes")
-            lines.append("")
+            write("### Critical Notes\n\n")
             for note in critical:
-                lines.append(f"- {note}")
-            lines.append("")
+                write(f"- {note}\n")
+            write("\n")
 
         # Mermaid Diagrams
         if mermaid_outputs:
-            lines.append("### Diagrams")
-            lines.append("")
+            write("### Diagrams\n\n")
             for mermaid in mermaid_outputs:
                 m_title = ""
                 m_code = ""
@@ -462,182 +520,146 @@ class ReportGenerator:
                     continue
 
                 if m_code:
-                    lines.append(f"#### {m_title}")
-                    lines.append("")
-                    lines.append("```mermaid")
-                    lines.append(m_code)
-                    lines.append("```")
-                    lines.append("")
+                    write(f"#### {m_title}\n\n")
+                    write(f"```mermaid\n{m_code}\n```\n\n")
 
         # Confidence metrics
         confidence = result.get("confidence", None)
         reproducibility = result.get("reproducibility_score", None)
         if confidence is not None or reproducibility is not None:
-            lines.append("### Confidence Metrics")
+            write("### Confidence Metrics\n")
             if confidence is not None:
-                lines.append(f"- Extraction Confidence: {confidence:.0%}")
+                write(f"- Extraction Confidence: {confidence:.0%}\n")
             if reproducibility is not None:
-                lines.append(f"- Reproducibility Score: {reproducibility:.0%}")
-            lines.append("")
-
-        return "\n".join(lines)
+                write(f"- Reproducibility Score: {reproducibility:.0%}\n")
+            write("\n")
 
-    def _build_phase4_deep_dive(self, result: Optional[dict]) -> str:
+    def _build_phase4_deep_dive(
+        self, buf: io.StringIO, result: Optional[dict]
+    ) -> None:
         """Build Phase 4: Deep Dive section."""
-        lines = ["## Phase 4: Deep Dive"]
-        lines.append("")
+        write = buf.write
+        write("## Phase 4: Deep Dive\n\n")
 
         if result is None:
-            lines.append("*Phase 4 was not completed.*")
-            return "\n".join(lines)
+            write("*Phase 4 was not completed.*\n")
+            return
 
         # Research Background (Why?)
         analysis = result.get("detailed_analysis", "")
         if analysis:
-            lines.append("### Research Background")
-            lines.append("")
-            lines.append(analysis)
-            lines.append("")
+            write(f"### Research Background\n\n{analysis}\n\n")
 
         # Prior Work Comparison
         comparison = result.get("comparison_to_prior_work", "")
         if comparison:
-            lines.append("### Prior Work Comparison")
-            lines.append("")
-            lines.append(comparison)
-            lines.append("")
+            write(f"### Prior Work Comparison\n\n{comparison}\n\n")
 
         # Strengths
         strengths = result.get("strengths", [])
         if strengths:
-            lines.append("### Strengths")
-            lines.append("")
+            write("### Strengths\n\n")
             for s in strengths:
-                lines.append(f"- {s}")
-            lines.append("")
+                write(f"- {s}\n")
+            write("\n")
 
         # Weaknesses
         weaknesses = result.get("weaknesses", [])
         if weaknesses:
-            lines.append("### Weaknesses")
-            lines.append("")
+            write("### Weaknesses\n\n")
             for w in weaknesses:
-                lines.append(f"- {w}")
-            lines.append("")
+                write(f"- {w}\n")
+            write("\n")
 
         # Novelty
         novelty = result.get("novelty_assessment", "")
         if novelty:
-            lines.append("### Novelty Assessment")
-            lines.append("")
-            lines.append(novelty)
-            lines.append("")
+            write(f"### Novelty Assessment\n\n{novelty}\n\n")
 
         # Critical Analysis (Claim vs Evidence)
         # This may be part of detailed_analysis or a separate field
         critical = result.get("critical_analysis", "")
         if critical:
-            lines.append("### Critical Analysis")
-            lines.append("")
-            lines.append(critical)
-            lines.append("")
+            write(f"### Critical Analysis\n\n{critical}\n\n")
 
         # Limitations
         limitations = result.get("limitations", [])
         if limitations:
-            lines.append("### Limitations")
-            lines.append("")
+            write("### Limitations\n\n")
             for lim in limitations:
-                lines.append(f"- {lim}")
-            lines.append("")
+                write(f"- {lim}\n")
+            write("\n")
 
         # Suggested improvements
         improvements = result.get("suggested_improvements", [])
         if improvements:
-            lines.append("### Suggested Improvements")
-            lines.append("")
+            write("### Suggested Improvements\n\n")
             for imp in improvements:
-                lines.append(f"- {imp}")
-            lines.append("")
+                write(f"- {imp}\n")
+            write("\n")
 
         # Follow-up questions
         questions = result.get("follow_up_questions", [])
         if questions:
-            lines.append("### Follow-up Questions")
-            lines.append("")
+            write("### Follow-up Questions\n\n")
             for q in questions:
-                lines.append(f"- {q}")
-            lines.append("")
+                write(f"- {q}\n")
+            write("\n")
 
         # Practical applications
         applications = result.get("practical_applications", [])
         if applications:
-            lines.append("### Practical Applications")
-            lines.append("")
+            write("### Practical Applications\n\n")
             for app in applications:
-                lines.append(f"- {app}")
-            lines.append("")
-
-        return "\n".join(lines)
+                write(f"- {app}\n")
+            write("\n")
 
     def _build_paperbanana_section(
-        self, pb_paths: list[Optional[str]], paper_dir: str
-    ) -> str:
+        self, buf: io.StringIO, pb_paths: list[Optional[str]], paper_dir: str
+    ) -> None:
         """Build PaperBanana illustrations section."""
         valid_paths = [p for p in pb_paths if p]
         if not valid_paths:
-            return ""
+            return
 
-        lines = ["## PaperBanana Illustrations"]
-        lines.append("")
+        buf.write("## PaperBanana Illustrations\n\n")
 
         for path in valid_paths:
             rel_path = self._relative_path(path, paper_dir)
             filename = Path(path).stem.replace("_", " ").title()
-            lines.append(f"![{filename}]({rel_path})")
-            lines.append("")
-
-        return "\n".join(lines)
+            buf.write(f"![{filename}]({rel_path})\n\n")
 
-    def _build_cost_summary(self, analysis_report: Any) -> str:
+    def _build_cost_summary(self, buf: io.StringIO, analysis_report: Any) -> None:
         """Build API cost summary section."""
         total_cost = getattr(analysis_report, "total_cost_usd", 0.0)
         total_in = getattr(analysis_report, "total_tokens_in", 0)
         total_out = getattr(analysis_report, "total_tokens_out", 0)
 
         if total_cost == 0.0 and total_in == 0 and total_out == 0:
-            return ""
+            return
 
-        lines = ["## Analysis Cost Summary"]
-        lines.append("")
-        lines.append("| Metric | Value |")
-        lines.append("|--------|-------|")
-        lines.append(f"| Total Cost | ${total_cost:.4f} |")
-        lines.append(f"| Input Tokens | {total_in:,} |")
-        lines.append(f"| Output Tokens | {total_out:,} |")
+        write = buf.write
+        write(_COST_SUMMARY_TMPL.format(
+            total_cost=total_cost, total_in=total_in, total_out=total_out
+        ))
 
         # Per-phase breakdown
         phases = getattr(analysis_report, "phases", {})
         if phases:
-            lines.append("")
-            lines.append("### Per-Phase Breakdown")
-            lines.append("")
-            lines.append("| Phase | Model | Cost | Duration |")
-            lines.append("|-------|-------|------|----------|")
+            write("\n### Per-Phase Breakdown\n\n")
+            write(_PHASE_COST_TABLE_HEAD)
             for phase_name, pr in phases.items():
                 model = pr.usage.model if hasattr(pr, "usage") else "N/A"
                 cost = pr.usage.cost_usd if hasattr(pr, "usage") else 0.0
                 duration = pr.duration_seconds if hasattr(pr, "duration_seconds") else 0.0
                 status = pr.status if hasattr(pr, "status") else "?"
                 if status == "error":
-                    lines.append(f"| {phase_name} | {model} | ERROR | - |")
+                    write(f"| {phase_name} | {model} | ERROR | - |\n")
                 else:
-                    lines.append(
-                        f"| {phase_name} | {model} | ${cost:.4f} | {duration:.1f}s |"
+                    write(
+                        f"| {phase_name} | {model} | ${cost:.4f} | {duration:.1f}s |\n"
                     )
 
-        return "\n".join(lines)
-
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
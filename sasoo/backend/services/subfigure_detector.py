@@ -249,11 +249,13 @@ If no sub-figures are detected, return:
                 # Crop sub-figure
                 cropped = img.crop((x1, y1, x2, y2))
 
-                # Save sub-figure
+                # Save sub-figure (fast deflate: these crops are read back by
+                # the analysis pipeline, where the last few percent of PNG
+                # size don't matter)
                 sub_id = f"{figure.figure_id}{sf.label.lower()}"
                 sub_filename = f"{sub_id}.png"
                 sub_path = output_dir / sub_filename
-                cropped.save(sub_path, "PNG", optimize=True)
+                cropped.save(sub_path, "PNG", compress_level=1)
 
                 # Create Figure object for sub-figure
                 # Get sub-caption if available